@@ -130,6 +130,18 @@ class App(Adw.Application):
         self.add_main_option("css-path", 0, GLib.OptionFlags.NONE,
                              GLib.OptionArg.STRING, "Path to css file", None)
 
+        self.add_main_option("compact", 0, GLib.OptionFlags.NONE,
+                             GLib.OptionArg.NONE,
+                             "compact storage for large price lists", None)
+
+        self.add_main_option("check-delay", 0, GLib.OptionFlags.NONE,
+                             GLib.OptionArg.INT,
+                             "ms to wait for more pricelist edits", None)
+
+        self.add_main_option("check-max-delay", 0, GLib.OptionFlags.NONE,
+                             GLib.OptionArg.INT,
+                             "ms until an edited pricelist is checked", None)
+
         # -v is alredy used by doctests
         self.add_main_option("version", 0, GLib.OptionFlags.NONE,
                              GLib.OptionArg.NONE, "say version", None)
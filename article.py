@@ -27,8 +27,10 @@
 
 import sys
 import os
-import re
-import gi
+import weakref
+from functools import lru_cache
+from fractions import Fraction
+from difflib import SequenceMatcher
 
 dir1 = os.path.dirname(os.path.realpath(__file__))
 dir2 = os.path.dirname(dir1)
@@ -36,51 +38,255 @@ sys.path.append(dir2)
 
 try:
     from cashbox.read_appargs import appargs
-    from cashbox.data_list import DataList
+    from cashbox.data_list import DataList, call_weak_method
     from cashbox.locale_utils import _
-    from cashbox.app import App
+    from cashbox.backend import BACKEND, Object, Property, TYPE_INT64
 except ImportError as exc:
     print('Error: cashbox modules not found.', exc)
     sys.exit(1)
 
-try:
-    gi.require_version('Gtk', '4.0')
-    gi.require_version(namespace='Adw', version='1')
-    from gi.repository import GObject
-except (ImportError, ValueError) as exc:
-    print('Error: Dependencies not met.', exc)
-    sys.exit(1)
+
+@lru_cache(maxsize=4096)
+def format_cents(cents, separator, digits):
+    """
+    return a string representing the given cent amount.
+    The results are cached for the currency settings they depend on.
+
+    >>> format_cents(1234, ",", 2), format_cents(-5, ".", 2)
+    ('12,34', '-0.05')
+    """
+    sign = "-" if cents < 0 else ""
+    (whole, fraction) = divmod(abs(cents), 10**digits)
+    return f"{sign}{whole}{separator}{fraction:0{digits}d}"
+
+
+def parse_cents(txt, seps, digits):
+    """
+    calculate cents from a given string with integers only, so "0.29" is
+    29 and not 28.999999999999996. Return 0 if txt is not an amount with
+    at most digits digits after one of the separators seps.
+
+    >>> [parse_cents(t, ".", 2) for t in ["0.29", "4.35", " 7 ", "-1.5"]]
+    [29, 435, 700, -150]
+    >>> [parse_cents(t, ".", 2) for t in ["1.234", "1,2", "", ".", "1e3"]]
+    [0, 0, 0, 0, 0]
+    """
+    txt = txt.strip()
+    sign = 1
+    if txt[:1] in ("+", "-"):
+        if txt[0] == "-":
+            sign = -1
+        txt = txt[1:]
+    (whole, fraction) = (txt, "")
+    for separator in seps:
+        if separator in txt:
+            (whole, _sep, fraction) = txt.partition(separator)
+            break
+    if (not (whole or fraction) or len(fraction) > digits or
+            not (whole == "" or (whole.isascii() and whole.isdigit())) or
+            not (fraction == "" or
+                 (fraction.isascii() and fraction.isdigit()))):
+        return 0
+    return sign * (int(whole or "0") * 10**digits +
+                   int(fraction.ljust(digits, "0") or "0"))
+
+
+def separators(allow_sloppy):
+    """ separators accepted by str2cent """
+    if allow_sloppy:
+        return (appargs.separator, ".", ",")
+    return (appargs.separator, ".")
 
 
 def cent2str(cents):
     """ return a string representing the given cent amount """
-    return (f"{cents // appargs.cents}{appargs.separator}"
-            f"{cents % appargs.cents:0{appargs.digits}.0f}")
+    return format_cents(cents, appargs.separator, appargs.digits)
 
 
 def str2cent(txt, allow_sloppy=False):
-    """ calculate cents from a given string """
-    ret = 0
-    if allow_sloppy:
-        txt = re.sub(r"[.,]", appargs.separator, txt)
-    try:
-        price = float(txt)
-    except ValueError:
-        return ret
-    number_of_digits = str(txt)[::-1].find(appargs.separator)
-    if number_of_digits <= appargs.digits:
-        ret = int(price * appargs.cents)
-    return ret
+    """
+    calculate cents from a given string.
+    The currency separator and "." are accepted, if allow_sloppy also ","
+    """
+    return parse_cents(txt, separators(allow_sloppy), appargs.digits)
+
+
+def cents2strs(cents_list):
+    """ cent2str for many amounts, e.g. a column of prices """
+    separator = appargs.separator
+    digits = appargs.digits
+    return [format_cents(cents, separator, digits) for cents in cents_list]
+
+
+def strs2cents(texts, allow_sloppy=False):
+    """ str2cent for many strings """
+    seps = separators(allow_sloppy)
+    digits = appargs.digits
+    return [parse_cents(txt, seps, digits) for txt in texts]
+
+
+def raise_cents(cents_list, percent):
+    """
+    raise many amounts by percent, rounded half up to whole cents.
+    percent may be a string like "2.5", only integers are used.
+
+    >>> raise_cents([100, 199, 5, 1000], 10), raise_cents([200], "2.5")
+    ([110, 219, 6, 1100], [205])
+    """
+    percent = Fraction(str(percent))
+    # cents * (100 + percent) / 100, rounded half up
+    numerator = 2 * (100 * percent.denominator + percent.numerator)
+    denominator = 200 * percent.denominator
+    half = 100 * percent.denominator
+    return [(cents * numerator + half) // denominator for cents in cents_list]
+
 
+def round_cents(cents_list, step):
+    """
+    round many amounts half up to a multiple of step cents
+
+    >>> round_cents([104, 105, 0, 1999], 10)
+    [100, 110, 0, 2000]
+    """
+    return [(2 * cents + step) // (2 * step) * step for cents in cents_list]
 
-class Article(GObject.Object):
-    """ Atricle with name price and count """
-    name = GObject.Property(type=str)
-    price = GObject.Property(type=int)
-    count = GObject.Property(type=int)
+
+def write_lines(lines, fileobj, chunk=256):
+    """
+    write lines separated by newlines to fileobj, chunk lines at a time,
+    without building the whole text
+    """
+    parts = []
+    separator = ""
+    for line in lines:
+        parts.append(separator)
+        parts.append(line)
+        separator = "\n"
+        if len(parts) >= 2 * chunk:
+            fileobj.write("".join(parts))
+            parts.clear()
+    if parts:
+        fileobj.write("".join(parts))
+
+
+class Transaction():
+    """
+    The Articles picked by one customer.
+    Only picked Articles are stored: Article -> count
+    """
+
+    def __init__(self):
+        self.counts = {}
+
+    def __len__(self):
+        return len(self.counts)
+
+    def get(self, article):
+        """ count of article """
+        return self.counts.get(article, 0)
+
+    def set(self, article, count):
+        """ change count of article """
+        if count:
+            self.counts[article] = count
+        else:
+            self.counts.pop(article, None)
+
+
+class Register():
+    """ cash register of a Sale, with the Transaction of the customer """
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self):
+        self.transaction = Transaction()
+
+
+class Orders(Object):
+    """
+    The open orders of a Sale, e.g. of tables still choosing drinks.
+    Each order is a Transaction, all orders share the Articles of the Sale.
+    current is the position of the order shown by the Sale.
+    """
+    __slots__ = ("transactions", "left")
+    current = Property(type=int)
+    size = Property(type=int)
+
+    def __init__(self, transaction):
+        super().__init__()
+        self.transactions = [transaction]
+        self.size = 1
+        # name -> [(Transaction, count)] of removed Articles in other orders
+        self.left = {}
+
+    def leave(self, article):
+        """
+        remove article from all orders. Its counts in the orders, that are
+        not shown, are kept by its name, e.g. while its line is invalid.
+        """
+        counts = [(transaction, transaction.get(article))
+                  for (pos, transaction) in enumerate(self.transactions)
+                  if pos != self.current and transaction.get(article)]
+        if counts:
+            self.left[article.name] = counts
+        for transaction in self.transactions:
+            transaction.set(article, 0)
+
+    def rejoin(self, article):
+        """
+        give a new article the counts, that an article with the same name
+        had in the open orders, that are not shown, when it left
+        """
+        for (transaction, count) in self.left.pop(article.name, ()):
+            for (pos, other) in enumerate(self.transactions):
+                if other is transaction and pos != self.current:
+                    transaction.set(article, count)
+
+    def append(self, transaction):
+        """ add an order and return its position """
+        self.transactions.append(transaction)
+        self.size = len(self.transactions)
+        return self.size - 1
+
+    def remove(self, pos):
+        """ remove the order at pos, that is not the current one """
+        del self.transactions[pos]
+        if self.current > pos:
+            self.current -= 1
+        self.size = len(self.transactions)
+
+
+class Article(Object):
+    """
+    Atricle with name price and count.
+    sold counts how often the Article has been sold since the start.
+    The count of an Article in a Sale is stored in the Transaction of the
+    current customer, name and price are not changed by selling.
+    """
+    __slots__ = ("register", "own_count")
+    name = Property(type=str)
+    price = Property(type=TYPE_INT64)
+    sold = Property(type=TYPE_INT64)
+
+    def get_count(self):
+        """ count of the current customer """
+        if self.register is None:
+            return self.own_count
+        return self.register.transaction.get(self)
+
+    def set_count(self, count):
+        """ change count of the current customer """
+        if self.register is None:
+            self.own_count = count
+        else:
+            self.register.transaction.set(self, count)
+
+    count = Property(type=TYPE_INT64, getter=get_count,
+                     setter=set_count)
 
     def __init__(self, name, price, count=0):
         super().__init__()
+        self.register = None
+        self.own_count = 0
         self.name = name
         self.price = price
         self.count = count
@@ -97,9 +303,9 @@ class Article(GObject.Object):
         return ret
 
 
-class Comment(GObject.Object):
+class Comment(Object):
     """ A Pricelist Comment """
-    comment = GObject.Property(type=str)
+    comment = Property(type=str)
 
     def __str__(self):
         return f"{self.comment}"
@@ -113,11 +319,11 @@ class Comment(GObject.Object):
         return str(self)
 
 
-class DropDownHead(GObject.Object):
+class DropDownHead(Object):
     """ DropDownHead is a header for a DropDown Widget.
     The Header itself can't be selected.
     """
-    drop_down_head = GObject.Property(type=str)
+    drop_down_head = Property(type=str)
 
     def __str__(self):
         return f"DropDownHead=<{self.drop_down_head}>"
@@ -131,20 +337,175 @@ class DropDownHead(GObject.Object):
         return str(self)
 
 
+class Totals(Object):
+    """
+    Running totals of a Sale, that can be bound to widgets:
+    total_cents: price to pay for all picked Articles
+    total_items: number of picked Articles
+    """
+    # pylint: disable=too-few-public-methods
+    total_cents = Property(type=TYPE_INT64)
+    total_items = Property(type=TYPE_INT64)
+
+    def add(self, cents, items):
+        """ change the totals, notify only if they changed """
+        if cents:
+            self.total_cents += cents
+        if items:
+            self.total_items += items
+
+
+def item_value(item):
+    """
+    (is Article, name or comment, price, count) of an item, the first two
+    are used to find matching items
+    """
+    if isinstance(item, Article):
+        return (True, item.name, item.price, item.count)
+    return (False, item.comment, 0, 0)
+
+
+def value_item(value):
+    """ new Article or Comment of an item_value() """
+    (article, name, price, count) = value
+    if article:
+        return Article(name, price, count)
+    return Comment(name)
+
+
+def item_values(main_list, start, end):
+    """ item_value() of the items of main_list from start to end """
+    # a ColumnSale gives the values without creating items
+    if hasattr(main_list, "values"):
+        return main_list.values(start, end)
+    return [item_value(main_list[i]) for i in range(start, end)]
+
+
+def update_item(item, value):
+    """ change item in place to value, an item_value() of the same kind """
+    (article, name, price, count) = value
+    if article:
+        for (field, new) in (("name", name), ("price", price),
+                             ("count", count)):
+            if getattr(item, field) != new:
+                setattr(item, field, new)
+    elif item.comment != name:
+        item.comment = name
+
+
+def set_value(main_list, position, value):
+    """ change the item at position in place to value of the same kind """
+    # a ColumnSale changes its columns without an item
+    if hasattr(main_list, "set_values"):
+        main_list.set_values(position, value)
+    else:
+        update_item(main_list[position], value)
+
+
+def update_values(main_list, pos, old_values, values):
+    """
+    change the items of main_list from pos, that match values by name and
+    position, in place. Return the splices [start, removals, values]
+    needed for the rest, relative to pos.
+    """
+    splices = []
+    opcodes = SequenceMatcher(None, [value[:2] for value in old_values],
+                              [value[:2] for value in values],
+                              autojunk=False).get_opcodes()
+    for (_tag, i1, i2, j1, j2) in opcodes:
+        # equal or replaced items are changed in place, if possible
+        same = min(i2 - i1, j2 - j1)
+        for k in range(same):
+            (old, new) = (old_values[i1 + k], values[j1 + k])
+            if old == new:
+                continue
+            if old[0] != new[0]:
+                splices.append([i1 + k, 1, [new]])
+            else:
+                set_value(main_list, pos + i1 + k, new)
+        if i2 - i1 > same or j2 - j1 > same:
+            splices.append([i1 + same, i2 - i1 - same, values[j1 + same:j2]])
+    return splices
+
+
+def join_splices(splices):
+    """ join neighbouring splices [start, removals, values] """
+    joined = []
+    for splice in splices:
+        if joined and joined[-1][0] + joined[-1][1] == splice[0]:
+            joined[-1][1] += splice[1]
+            joined[-1][2] = joined[-1][2] + splice[2]
+        else:
+            joined.append(splice)
+    return joined
+
+
+def reconcile(main_list, pos, removed, values):
+    """
+    replace <removed> items of main_list at pos with items of values, the
+    item_value()s of the new lines. The existing Articles and Comments,
+    that match values by name and position, are kept and changed in
+    place, so their counts in other orders and the rows showing them are
+    kept. The rest is changed with few splices, only they create new
+    items. A ColumnSale writes the values to its columns without items.
+    Return the number of splices.
+    """
+    joined = join_splices(update_values(
+        main_list, pos, item_values(main_list, pos, pos + removed), values))
+    # from the end, so the positions of the former splices stay valid
+    for (start, n_removals, additions) in reversed(joined):
+        if hasattr(main_list, "splice_values"):
+            main_list.splice_values(pos + start, n_removals, additions)
+        else:
+            main_list.splice(pos + start, n_removals,
+                             [value_item(value) for value in additions])
+    return len(joined)
+
+
 class Sale(DataList):
     """ Sale """
-
-    def __init__(self):
-        super().__init__()
+    # the indexes, totals and orders follow each change of the Articles
+    # pylint: disable=too-many-instance-attributes,too-many-public-methods
+
+    # orders of drop_unpicked_by(): (label, sort key, properties used)
+    DROP_ORDERS = {
+        "pricelist": (_("as in pricelist"), True, None),
+        "name": (_("by name"), lambda article: article.name.casefold(),
+                 {"name"}),
+        "price": (_("by price"), lambda article: article.price, {"price"}),
+        "sold": (_("most sold first"), lambda article: -article.sold,
+                 {"sold"}),
+    }
+
+    def __init__(self, **kwargs):
+        # name -> Articles with this name, to find Articles by name
+        self.names = {}
+        # Article -> name used in self.names
+        self.article_name = {}
+        self.weak_on_name_changed = weakref.WeakMethod(self.on_name_changed)
+        # totals are changed by each price and count change
+        self.totals = Totals()
+        # Article -> (price, count) included in self.totals
+        self.amounts = {}
+        # the counts of all Articles are in self.register.transaction
+        self.register = Register()
+        # open orders, the current one is self.register.transaction
+        self.orders = Orders(self.register.transaction)
+        self.weak_on_amount_changed = weakref.WeakMethod(
+            self.on_amount_changed)
+        super().__init__(**kwargs)
 
         # self.main_list
-        self.add_plus_list(pick=self.is_picked,
+        # picked or unpicked only depends on count
+        self.add_plus_list(pick=self.is_picked, fields={"count"},
                            selfname="picked")  # self.picked
-        self.add_plus_list(pick=self.is_unpicked,
+        self.add_plus_list(pick=self.is_unpicked, fields={"count"},
                            selfname="unpicked")  # self.unpicked
-        self.add_plus_list(pick=self.is_unpicked, sort=True,
+        self.add_plus_list(pick=self.is_unpicked, sort=True, fields={"count"},
                            item1=DropDownHead(_("select article")),
                            selfname="drop_unpicked")  # self.drop_unpicked
+        # more orders of drop_unpicked, created when first needed
+        self.drop_unpicked_orders = {"pricelist": self.drop_unpicked}
 
     def is_picked(self, item):
         """ Articles can be picked """
@@ -165,42 +526,214 @@ class Sale(DataList):
         This will make Sale ediable as text.
         All relevant information is included.
         """
-        return "\n".join([data.text() for data in self.main_list])
+        return "\n".join(self.iter_lines())
+
+    def iter_lines(self):
+        """ lines of text(), one by one """
+        for data in self.main_list:
+            yield data.text()
+
+    def write_to(self, fileobj, chunk=256):
+        """ write text() to fileobj, without building the whole text """
+        write_lines(self.iter_lines(), fileobj, chunk)
+
+    def connect_item(self, item):
+        """ add Articles to the name index, the totals and the register """
+        if isinstance(item, Article) and item.register is not self.register:
+            count = item.count
+            item.register = self.register
+            self.register.transaction.set(item, count)
+            self.orders.rejoin(item)
+        super().connect_item(item)
+        if isinstance(item, Article):
+            self.add_name(item, item.name)
+            self.amounts[item] = (item.price, item.count)
+            self.totals.add(item.price * item.count, item.count)
+            self.handlers[item] += [
+                item.connect("notify::name", call_weak_method,
+                             self.weak_on_name_changed),
+                item.connect("notify::price", call_weak_method,
+                             self.weak_on_amount_changed),
+                item.connect("notify::count", call_weak_method,
+                             self.weak_on_amount_changed)]
+
+    def disconnect_item(self, item):
+        """ remove Articles from the name index and the totals """
+        super().disconnect_item(item)
+        name = self.article_name.pop(item, None)
+        if name is not None:
+            self.del_name(item, name)
+        amount = self.amounts.pop(item, None)
+        if amount is not None:
+            (price, count) = amount
+            self.totals.add(-price * count, -count)
+        if isinstance(item, Article) and item.register is self.register:
+            # a removed Article keeps its count, but leaves all orders
+            count = item.count
+            self.orders.leave(item)
+            item.register = None
+            item.own_count = count
+
+    def on_amount_changed(self, article, _pspec):
+        """ keep the totals up to date """
+        (price, count) = self.amounts[article]
+        self.amounts[article] = (article.price, article.count)
+        self.totals.add(article.price * article.count - price * count,
+                        article.count - count)
+
+    def add_name(self, article, name):
+        """ add article to the name index """
+        self.article_name[article] = name
+        self.names.setdefault(name, []).append(article)
+
+    def del_name(self, article, name):
+        """ remove article from the name index """
+        articles = self.names[name]
+        articles.remove(article)
+        if not articles:
+            del self.names[name]
+
+    def on_name_changed(self, article, _pspec):
+        """ keep the name index up to date """
+        self.del_name(article, self.article_name[article])
+        self.add_name(article, article.name)
 
     def get_article(self, name, picked=None):
         """
         get article with given name or None.
+        If more articles have the same name, the first one is used.
         picked:
           None: no matter if picked
           False: not picked
           True: picked
         """
         found = None
-        for data in self.main_list:
-            if isinstance(data, Article):
-                if data.name == name:
-                    if picked is True:
-                        if data.count > 0:
-                            found = data
-                    elif picked is False:
-                        if data.count == 0:
-                            found = data
-                    elif picked is None:
-                        found = data
-                    break
+        articles = self.names.get(name)
+        if articles:
+            if len(articles) == 1:
+                data = articles[0]
+            else:
+                data = min(articles, key=self.rank.key.__getitem__)
+            if picked is True:
+                if data.count > 0:
+                    found = data
+            elif picked is False:
+                if data.count == 0:
+                    found = data
+            elif picked is None:
+                found = data
         return found
 
+    def drop_unpicked_by(self, order):
+        """
+        return drop_unpicked in one of the DROP_ORDERS.
+        The order is kept up to date incrementally, like drop_unpicked.
+        """
+        if order not in self.drop_unpicked_orders:
+            (_label, sort, sort_fields) = self.DROP_ORDERS[order]
+            self.drop_unpicked_orders[order] = self.add_plus_list(
+                pick=self.is_unpicked, sort=sort, fields={"count"},
+                sort_fields=sort_fields,
+                item1=DropDownHead(_("select article")))
+        return self.drop_unpicked_orders[order]
+
+    def add_sold(self):
+        """
+        add count of the picked Articles to sold, when the sale is done
+        """
+        with self.batch():
+            for article in list(self.picked):
+                article.sold += article.count
+
+    @property
+    def transaction(self):
+        """ Transaction of the current customer """
+        return self.register.transaction
+
+    def next_customer(self):
+        """
+        start with a new customer, without picked articles.
+        Only the picked Articles of the former Transaction are changed.
+        Return the former Transaction.
+        """
+        transaction = self.register.transaction
+        self.register.transaction = Transaction()
+        self.orders.transactions[self.orders.current] = \
+            self.register.transaction
+        for article in transaction.counts:
+            article.notify("count")
+        return transaction
+
     def count_zero(self):
         """
         e.g. start with a new customer, without picked articles
         """
-        for article in self.main_list:
-            article.count = 0
+        self.next_customer()
+
+    def change_prices(self, function):
+        """
+        change the prices of all Articles in one pass.
+        function gets the list of all prices and returns the new prices,
+        e.g. raise_cents or round_cents.
+        """
+        articles = [item for item in self.main_list
+                    if isinstance(item, Article)]
+        prices = function([article.price for article in articles])
+        with self.batch():
+            for (article, price) in zip(articles, prices):
+                if article.price != price:
+                    article.price = price
+
+    def raise_prices(self, percent):
+        """ raise all prices by percent """
+        self.change_prices(lambda prices: raise_cents(prices, percent))
+
+    def round_prices(self, step):
+        """ round all prices to a multiple of step cents """
+        self.change_prices(lambda prices: round_cents(prices, step))
+
+    def switch_order(self, pos):
+        """
+        show the order at pos. Only the Articles picked in the former or
+        the new order are changed.
+        """
+        transaction = self.orders.transactions[pos]
+        former = self.register.transaction
+        self.register.transaction = transaction
+        self.orders.current = pos
+        if transaction is not former:
+            with self.batch():
+                for article in {**former.counts, **transaction.counts}:
+                    article.notify("count")
+
+    def new_order(self):
+        """ open a new order without picked Articles and show it """
+        pos = self.orders.append(Transaction())
+        self.switch_order(pos)
+        return pos
+
+    def close_order(self):
+        """
+        close the current order, e.g. after its receipt, and show the
+        former order. The last order stays open without picked Articles.
+        """
+        self.next_customer()
+        closed = self.orders.current
+        if self.orders.size > 1:
+            self.switch_order(closed - 1 if closed else 1)
+            self.orders.remove(closed)
 
 
 if __name__ == '__main__':
 
-    App().run(sys.argv)
+    if BACKEND == "gi":
+        from cashbox.app import App
+        App().run(sys.argv)
+    else:
+        appargs.read_appargs({}, [])
+    import io
+    import doctest
+    doctest.testmod()
     sale = Sale()
 
     for d in [Comment("one two three"), Article("Banana", 110, 1),
@@ -236,4 +769,228 @@ Blueberry 2.00 6"""
     assert a.price == 200
     assert a.count == 3
 
+    # only count is connected, other changes do not reach the plus lists
+    assert sale.signals == {"notify::count"}
+    a.price = 210
+    a.name = "Green Apple"
+    assert f"{sale.get_article('Green Apple', picked=True)}" == \
+        "(Green Apple,2.10,3)"
+
+    # write_to gives the same text without joining all lines
+    for chunk_size in [1, 2, 256]:
+        stream = io.StringIO()
+        sale.write_to(stream, chunk_size)
+        assert stream.getvalue() == sale.text()
+
+    # totals follow all changes, without a sum over picked
+    def check_totals(checked):
+        """ totals must be the sum of the picked Articles """
+        assert checked.totals.total_cents == sum(a.price * a.count
+                                                 for a in checked.picked)
+        assert checked.totals.total_items == sum(a.count
+                                                 for a in checked.picked)
+
+    check_totals(sale)
+    notified = []
+    sale.totals.connect("notify::total-cents",
+                        lambda totals, _p: notified.append(totals.total_cents))
+    sale.get_article("Banana").count += 2
+    assert notified == [sale.totals.total_cents]
+    sale.get_article("Banana").price = 120
+    sale.main_list.remove(1)
+    check_totals(sale)
+    sale.main_list.insert(1, Article("Banana", 110, 1))
+    check_totals(sale)
+
+    # the name index follows inserts, removals and renames
+    sale.main_list.insert(0, Article("Pear", 100, 0))
+    assert sale.get_article("Pear").price == 100
+    sale.main_list.remove(0)
+    assert sale.get_article("Pear").price == 335
+    sale.get_article("Green Apple").name = "Apple"
+    assert sale.get_article("Green Apple") is None
+    assert sale.get_article("Apple").price == 210
+    sale.main_list.append(Article("Apple", 1, 0))
+    assert sale.get_article("Apple").price == 210
+    assert sale.get_article("Apple", picked=False) is None
+    sale.main_list.remove(len(sale.main_list) - 1)
+    sale.get_article("Apple").name = "Green Apple"
+    assert set(sale.names) == {a.name for a in sale.main_list
+                               if isinstance(a, Article)}
+
+    # drop_unpicked in other orders
+    by_name = sale.drop_unpicked_by("name")
+    most_sold = sale.drop_unpicked_by("sold")
+    assert sale.drop_unpicked_by("name") is by_name
+    sale.add_sold()
+    sale.count_zero()
+    assert [d.name for d in list(by_name)[1:]] == [
+        "Banana", "Blueberry", "Green Apple", "Pear", "Strawberry",
+        "Watermelon"]
+    assert [d.name for d in list(most_sold)[1:]] == [
+        "Blueberry", "Watermelon", "Pear", "Green Apple", "Strawberry",
+        "Banana"]
+    sale.get_article("Banana").count = 10
+    sale.add_sold()
+    sale.count_zero()
+    assert list(most_sold)[1].name == "Banana"
+    sale.get_article("Pear").name = "Apricot"
+    assert list(by_name)[1].name == "Apricot"
+    assert [d.name for d in list(sale.drop_unpicked_by("price"))[1:3]] == [
+        "Watermelon", "Banana"]
+    check_totals(sale)
+    assert sale.totals.total_items == 0
+
+    # a new customer changes only the picked Articles
+    sale.get_article("Apricot").count = 2
+    sale.get_article("Banana").count = 1
+    counted = []
+    for fruit in sale.main_list:
+        if isinstance(fruit, Article):
+            fruit.connect("notify::count",
+                          lambda fruit, _p: counted.append(fruit.name))
+    done = sale.next_customer()
+    assert sorted(counted) == ["Apricot", "Banana"]
+    assert len(done) == 2 and len(sale.transaction) == 0
+    assert sale.totals.total_cents == 0 and len(sale.picked) == 0
+    assert len(sale.drop_unpicked) == 7
+
+    # removed Articles keep their count outside of the transaction
+    sale.get_article("Banana").count = 4
+    banana = sale.get_article("Banana")
+    sale.main_list.remove(sale.main_list.find(banana)[1])
+    assert banana.count == 4 and len(sale.transaction) == 0
+    sale.main_list.append(banana)
+    assert sale.transaction.get(banana) == 4
+    check_totals(sale)
+
+    # open orders share the Articles, each keeps its own counts
+    assert sale.new_order() == 1 and sale.orders.size == 2
+    assert banana.count == 0 and len(sale.picked) == 0
+    check_totals(sale)
+    sale.get_article("Apricot").count = 3
+    sale.switch_order(0)
+    assert banana.count == 4 and sale.get_article("Apricot").count == 0
+    assert [a.name for a in sale.picked] == ["Banana"]
+    check_totals(sale)
+    sale.switch_order(1)
+    assert sale.transaction.counts == {sale.get_article("Apricot"): 3}
+    # a removed Article leaves all orders, its counts in the other orders
+    # are back, when it is added again
+    sale.main_list.remove(sale.main_list.find(banana)[1])
+    assert sale.orders.transactions[0].get(banana) == 0
+    sale.main_list.append(banana)
+    assert sale.orders.transactions[0].get(banana) == 4
+    # closing the receipt of an order shows the former one
+    sale.close_order()
+    assert sale.orders.size == 1 and sale.orders.current == 0
+    assert [a.name for a in sale.picked] == ["Banana"]
+    assert sale.get_article("Apricot").count == 0
+    sale.close_order()
+    assert sale.orders.size == 1 and len(sale.transaction) == 0
+    check_totals(sale)
+
+    # bulk price changes in one pass, the totals follow
+    sale.get_article("Apricot").count = 2
+    old_prices = {a.name: a.price for a in sale.main_list
+                  if isinstance(a, Article)}
+    sale.raise_prices(10)
+    assert all(a.price == raise_cents([old_prices[a.name]], 10)[0]
+               for a in sale.main_list if isinstance(a, Article))
+    sale.round_prices(10)
+    assert all(a.price % 10 == 0 for a in sale.main_list
+               if isinstance(a, Article))
+    assert [a.price for a in list(sale.drop_unpicked_by("price"))[1:]] == \
+        sorted(a.price for a in sale.unpicked)
+    check_totals(sale)
+    sale.count_zero()
+
+    # reconcile keeps matching Articles, so other orders keep their counts
+    sale.replace_all([Comment("# fruits"), Article("Apple", 200, 1),
+                      Article("Pear", 300), Article("Kiwi", 50, 2)])
+    (apple, pear, kiwi) = [sale.main_list[i] for i in range(1, 4)]
+    sale.new_order()
+    pear.count = 5
+    sale.switch_order(0)
+    changes = []
+    sale.main_list.connect("items-changed",
+                           lambda _l, *change: changes.append(change))
+    assert reconcile(sale.main_list, 0, 4, [
+        (False, "# fruits", 0, 0), (True, "Apple", 210, 1),
+        (False, "# new", 0, 0), (True, "Pear", 300, 0),
+        (True, "Kiwi", 50, 3)]) == 1
+    assert changes == [(2, 0, 1)]
+    assert [sale.main_list[i] for i in (1, 3, 4)] == [apple, pear, kiwi]
+    assert apple.price == 210 and kiwi.count == 3
+    sale.switch_order(1)
+    assert pear.count == 5
+    sale.close_order()
+    # a renamed Article is changed in place, too
+    assert reconcile(sale.main_list, 3, 2, [(True, "Banana", 300, 0),
+                                            (False, "Kiwi 0,5x", 0, 0)]) == 1
+    assert sale.main_list[3] is pear and pear.name == "Banana"
+    assert sale.get_article("Banana") is pear
+    assert sale.get_article("Kiwi") is None
+    check_totals(sale)
+    # the counts of an Article, whose line is invalid for a while, are
+    # back in every order, when the line is valid again
+    pear.count = 2
+    sale.new_order()
+    pear.count = 1
+    reconcile(sale.main_list, 3, 1, [(False, "Banana 3,0 1", 0, 0)])
+    assert sale.orders.transactions[0].counts == {apple: 1}
+    reconcile(sale.main_list, 3, 1, [(True, "Banana", 300, 1)])
+    banana = sale.get_article("Banana")
+    assert banana is not pear and banana.count == 1
+    sale.switch_order(0)
+    assert banana.count == 2 and apple.count == 1
+    check_totals(sale)
+
+    # money and counts of large events do not fit in 32 bits
+    big = 2**31 + 7
+    festival = Sale()
+    festival.replace_all([Article("Beer", big, 3), Article("Pass", 1, big)])
+    beer = festival.get_article("Beer")
+    assert beer.price == big and festival.get_article("Pass").count == big
+    assert festival.totals.total_cents == 4 * big
+    assert festival.totals.total_items == big + 3
+    festival.add_sold()
+    assert beer.sold == 3 and festival.get_article("Pass").sold == big
+    beer.price = 2**40
+    assert festival.totals.total_cents == 3 * 2**40 + big
+    assert cent2str(3 * 2**40 + big) == "33006823669.83"
+    festival.close_order()
+    assert festival.totals.total_cents == 0
+
+    # a new drop_unpicked_by() order keeps the counts of parked orders
+    bar = Sale()
+    bar.replace_all([Article("Beer", 300), Article("Wine", 400)])
+    bar.get_article("Beer").count = 2
+    bar.new_order()
+    bar.get_article("Wine").count = 1
+    for drop_order in ["name", "price", "sold"]:
+        bar.drop_unpicked_by(drop_order)
+    assert bar.orders.transactions[0].counts == {bar.get_article("Beer"): 2}
+    assert bar.transaction.counts == {bar.get_article("Wine"): 1}
+    bar.switch_order(0)
+    assert bar.get_article("Beer").count == 2
+    check_totals(bar)
+
+    # exact money conversion for all amounts up to 1000.00
+    for currency in ["Euro", "Dollar"]:
+        appargs.read_appargs({"currency": currency}, [])
+        all_cents = list(range(100001))
+        all_texts = cents2strs(all_cents)
+        assert strs2cents(all_texts) == all_cents
+        sep = appargs.separator
+        for (cent, shown) in zip(all_cents, all_texts):
+            assert shown == f"{cent // 100}{sep}{cent % 100:02d}"
+            assert str2cent(shown) == cent
+            assert str2cent(f"{cent / 100:.2f}") == cent
+            assert str2cent(shown.replace(sep, ","), True) == cent
+        assert str2cent("0.29") == 29 and str2cent("4.35") == 435
+        assert str2cent("1.2") == 120 and str2cent("1.234") == 0
+        assert str2cent("x") == 0 and str2cent("1,5", True) == 150
+    assert cent2str(150) == "1.50" and cent2str(150) is cent2str(150)
+
     print("all asserts have been ok")
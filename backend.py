@@ -0,0 +1,103 @@
+#!/usr/bin/python3
+
+# backend.py
+#
+# Copyright:
+#   Copyright (C) 2024-2025 Bernd Schumacher <bernd@bschu.de>
+#
+# License: GPL-3.0+
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#   .
+#   This package is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#   .
+#   You should have received a copy of the GNU General Public License
+#   along with this program. If not, see <https://www.gnu.org/licenses/>.
+# Comment:
+#   On Debian systems, the complete text of the GNU General
+#   Public License version 3 can be found in
+#   "/usr/share/common-licenses/GPL-3".
+
+"""
+backend.py selects at import time the object model used by DataList,
+Article and Sale:
+
+  CASHBOX_BACKEND=gi      (default) GObject.Object and Gio.ListStore,
+                          needed by the Gtk widgets
+  CASHBOX_BACKEND=python  plain python objects with __slots__ from
+                          pure_model.py, for tools without a display
+"""
+
+import sys
+import os
+
+dir1 = os.path.dirname(os.path.realpath(__file__))
+dir2 = os.path.dirname(dir1)
+sys.path.append(dir2)
+
+BACKEND = os.environ.get("CASHBOX_BACKEND", "gi")
+
+if BACKEND == "python":
+    try:
+        # pylint: disable=unused-import
+        from cashbox.pure_model import (Object, Property, ListStore,
+                                        ListModel, idle_add, timeout_add,
+                                        source_remove,
+                                        main_iteration, get_user_data_dir,
+                                        PRIORITY_HIGH_IDLE, SOURCE_REMOVE,
+                                        TYPE_INT64)
+    except ImportError as exc:
+        print('Error: cashbox modules not found.', exc)
+        sys.exit(1)
+
+    def handler_is_connected(obj, handler):
+        """ True if handler is connected to obj """
+        return obj.handler_is_connected(handler)
+
+elif BACKEND == "gi":
+    try:
+        import gi
+        gi.require_version(namespace='Adw', version='1')
+        from gi.repository import GObject, Gio, GLib
+    except (ImportError, ValueError) as exc:
+        print('Error: Dependencies not met.', exc)
+        sys.exit(1)
+
+    Object = GObject.Object
+    Property = GObject.Property
+    ListStore = Gio.ListStore
+    idle_add = GLib.idle_add
+    timeout_add = GLib.timeout_add
+    source_remove = GLib.source_remove
+    get_user_data_dir = GLib.get_user_data_dir
+    PRIORITY_HIGH_IDLE = GLib.PRIORITY_HIGH_IDLE
+    SOURCE_REMOVE = GLib.SOURCE_REMOVE
+    # type of money and count properties, type=int is only 32 bit
+    TYPE_INT64 = GObject.TYPE_INT64
+    handler_is_connected = GObject.signal_handler_is_connected
+
+    class ListModel(GObject.Object, Gio.ListModel):
+        """
+        base of list models implemented in python.
+        Subclasses define do_get_n_items() and do_get_item().
+        """
+        # pylint: disable=too-few-public-methods
+
+        def do_get_item_type(self):
+            """ Gio.ListModel.get_item_type() """
+            return GObject.Object.__gtype__
+
+    def main_iteration():
+        """ dispatch everything, that is pending in the main loop """
+        context = GLib.MainContext.default()
+        while context.pending():
+            context.iteration(False)
+
+else:
+    print(f'Error: CASHBOX_BACKEND <{BACKEND}> not gi or python.')
+    sys.exit(1)
@@ -0,0 +1,425 @@
+#!/usr/bin/python3
+
+# bench_model.py
+#
+# Copyright:
+#   Copyright (C) 2024-2025 Bernd Schumacher <bernd@bschu.de>
+#
+# License: GPL-3.0+
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#   .
+#   This package is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#   .
+#   You should have received a copy of the GNU General Public License
+#   along with this program. If not, see <https://www.gnu.org/licenses/>.
+# Comment:
+#   On Debian systems, the complete text of the GNU General
+#   Public License version 3 can be found in
+#   "/usr/share/common-licenses/GPL-3".
+
+"""
+time the core model operations of DataList, Sale, money conversion and
+Cshbx at catalog sizes of 100, 1000 and 10000 articles.
+
+No display is needed. Results can be saved as JSON and compared with a
+former run:
+
+  bench_model.py --output new.json
+  bench_model.py --baseline new.json
+
+Without --backend the pure python backend is used, with --backend gi
+GObject and Gio are used, like in the application.
+"""
+
+import sys
+import os
+import json
+import timeit
+import argparse
+import platform
+
+dir1 = os.path.dirname(os.path.realpath(__file__))
+dir2 = os.path.dirname(dir1)
+dir3 = os.path.dirname(dir2)
+sys.path.append(dir3)
+
+SIZES = [100, 1000, 10000]
+
+
+def parse_args(argv):
+    """ command line options """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", 1)[0])
+    parser.add_argument("--backend", choices=["python", "gi"],
+                        default=os.environ.get("CASHBOX_BACKEND", "python"),
+                        help="object model to benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES,
+                        help="catalog sizes")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="take the best of REPEAT runs")
+    parser.add_argument("--only", nargs="+", default=None,
+                        help="only run operations starting with ONLY")
+    parser.add_argument("--output", help="save results as JSON")
+    parser.add_argument("--baseline", help="compare with a saved JSON file")
+    parser.add_argument("--tolerance", type=float, default=1.25,
+                        help="report operations slower than baseline by "
+                        "more than this factor")
+    return parser.parse_args(argv)
+
+
+# the backend is chosen at import time of the cashbox modules
+ARGS = parse_args(sys.argv[1:]) if __name__ == '__main__' else None
+if ARGS:
+    os.environ["CASHBOX_BACKEND"] = ARGS.backend
+
+try:
+    from cashbox.backend import BACKEND, Object, Property
+    from cashbox.data_list import DataList
+    from cashbox.read_appargs import appargs
+    from cashbox.article import (Article, Comment, Sale, cent2str, str2cent,
+                                 cents2strs, strs2cents, reconcile)
+    from cashbox.column_sale import ColumnSale
+    from cashbox.cshbx import Cshbx
+except ImportError as exc:
+    print('Error: cashbox modules not found.', exc)
+    sys.exit(1)
+
+
+class Data(Object):
+    """ Benchmark Data """
+    # pylint: disable=too-few-public-methods
+    count = Property(type=int)
+
+    def __init__(self, count=0):
+        super().__init__()
+        self.count = count
+
+
+def new_data_list():
+    """ DataList with a picked and a sorted unpicked plus list """
+    data_list = DataList()
+    data_list.add_plus_list(pick=lambda data: data.count > 0,
+                            fields={"count"})
+    data_list.add_plus_list(pick=lambda data: data.count == 0, sort=True,
+                            item1=Data(-1), fields={"count"})
+    return data_list
+
+
+def new_sale(size, sale_class=Sale):
+    """ Sale with size articles and a comment every 10 articles """
+    sale = sale_class()
+    items = []
+    for i in range(size):
+        if i % 10 == 0:
+            items.append(Comment(f"# group {i // 10}"))
+        items.append(Article(f"Article {i:05}", 100 + i, i % 3))
+    sale.replace_all(items)
+    return sale
+
+
+def lines(size):
+    """ pricelist lines as typed by a user """
+    return [f"Article {i:05} {cent2str(100 + i)} {i % 5}"
+            for i in range(size)]
+
+
+# Each operation gets the catalog size and returns (setup, function).
+# setup() is called once before each timed run, function() is timed.
+# The time reported is per call of function().
+
+def op_data_list_append(size):
+    """ append size items one by one """
+    state = {}
+
+    def setup():
+        state["list"] = new_data_list()
+        state["items"] = [Data(i % 2) for i in range(size)]
+
+    def function():
+        main_list = state["list"].main_list
+        for item in state["items"]:
+            main_list.append(item)
+
+    return setup, function
+
+
+def op_data_list_clear(size):
+    """ clear a filled DataList """
+    state = {}
+
+    def setup():
+        state["list"] = new_data_list()
+        state["list"].replace_all([Data(i % 2) for i in range(size)])
+
+    def function():
+        state["list"].clear()
+
+    return setup, function
+
+
+def op_data_list_pick_unpick(size):
+    """ pick and unpick 100 items spread over the list """
+    state = {}
+
+    def setup():
+        state["list"] = new_data_list()
+        state["list"].replace_all([Data() for _ in range(size)])
+        step = max(1, size // 100)
+        main_list = state["list"].main_list
+        state["items"] = [main_list[i] for i in range(0, size, step)]
+
+    def function():
+        for item in state["items"]:
+            item.count = 1
+            item.count = 0
+
+    return setup, function
+
+
+def op_sale_get_article(size):
+    """ look up 100 article names spread over the catalog """
+    state = {}
+
+    def setup():
+        state["sale"] = new_sale(size)
+        step = max(1, size // 100)
+        state["names"] = [f"Article {i:05}" for i in range(0, size, step)]
+
+    def function():
+        sale = state["sale"]
+        for name in state["names"]:
+            sale.get_article(name)
+
+    return setup, function
+
+
+def op_sale_text(size):
+    """ text of the whole catalog """
+    state = {}
+
+    def setup():
+        state["sale"] = new_sale(size)
+
+    def function():
+        state["sale"].text()
+
+    return setup, function
+
+
+def op_sale_count_zero(size):
+    """ reset all counts of a catalog with picked articles """
+    state = {}
+
+    def setup():
+        state["sale"] = new_sale(size)
+
+    def function():
+        state["sale"].count_zero()
+
+    return setup, function
+
+
+def edit_lines(sale_class, size):
+    """ insert and remove 100 lines one by one, like typed lines """
+    state = {}
+
+    def setup():
+        state["sale"] = new_sale(size, sale_class)
+
+    def function():
+        main_list = state["sale"].main_list
+        pos = len(main_list) // 2
+        for i in range(100):
+            reconcile(main_list, pos, 0, [(True, f"New {i}", 100, 0)])
+            reconcile(main_list, pos, 1, [])
+
+    return setup, function
+
+
+def op_sale_edit_lines(size):
+    """ insert and remove 100 lines of a Sale """
+    return edit_lines(Sale, size)
+
+
+def op_column_sale_edit_lines(size):
+    """ insert and remove 100 lines of a ColumnSale """
+    return edit_lines(ColumnSale, size)
+
+
+def op_cent2str(size):
+    """ format size amounts """
+    cents = list(range(size))
+
+    def function():
+        for cent in cents:
+            cent2str(cent)
+
+    return None, function
+
+
+def op_str2cent(size):
+    """ parse size amounts """
+    texts = [cent2str(cent) for cent in range(size)]
+
+    def function():
+        for txt in texts:
+            str2cent(txt)
+
+    return None, function
+
+
+def op_cents2strs(size):
+    """ format a column of size amounts """
+    cents = list(range(size))
+
+    def function():
+        cents2strs(cents)
+
+    return None, function
+
+
+def op_strs2cents(size):
+    """ parse a column of size amounts """
+    texts = [cent2str(cent) for cent in range(size)]
+
+    def function():
+        strs2cents(texts)
+
+    return None, function
+
+
+def op_cshbx_get_cent_price(size):
+    """ price of size pricelist lines """
+    cshbx = Cshbx()
+    texts = lines(size)
+
+    def function():
+        for line in texts:
+            cshbx.get_cent_price(line)
+
+    return None, function
+
+
+def op_cshbx_check_line(size):
+    """ split size pricelist lines part by part """
+    cshbx = Cshbx()
+    texts = lines(size)
+
+    def function():
+        for line in texts:
+            cshbx.check_line(line)
+
+    return None, function
+
+
+def op_cshbx_scan(size):
+    """ split size pricelist lines with one match each """
+    cshbx = Cshbx()
+    texts = lines(size)
+
+    def function():
+        for line in texts:
+            cshbx.scan(line)
+
+    return None, function
+
+
+OPERATIONS = {
+    "data_list.append": op_data_list_append,
+    "data_list.clear": op_data_list_clear,
+    "data_list.pick_unpick": op_data_list_pick_unpick,
+    "sale.get_article": op_sale_get_article,
+    "sale.text": op_sale_text,
+    "sale.count_zero": op_sale_count_zero,
+    "sale.edit_lines": op_sale_edit_lines,
+    "column_sale.edit_lines": op_column_sale_edit_lines,
+    "cent2str": op_cent2str,
+    "str2cent": op_str2cent,
+    "cents2strs": op_cents2strs,
+    "strs2cents": op_strs2cents,
+    "cshbx.get_cent_price": op_cshbx_get_cent_price,
+    "cshbx.check_line": op_cshbx_check_line,
+    "cshbx.scan": op_cshbx_scan,
+}
+
+
+def bench(operation, size, repeat):
+    """ return the best time of repeat runs in seconds """
+    setup, function = OPERATIONS[operation](size)
+    best = None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        seconds = timeit.timeit(function, number=1)
+        best = seconds if best is None else min(best, seconds)
+    return best
+
+
+def run(sizes, repeat, only=None):
+    """ run all selected operations and return the results as dict """
+    results = {}
+    for operation in OPERATIONS:
+        if only and not any(operation.startswith(o) for o in only):
+            continue
+        results[operation] = {str(size): bench(operation, size, repeat)
+                              for size in sizes}
+    return {"backend": BACKEND, "python": platform.python_version(),
+            "repeat": repeat, "results": results}
+
+
+def compare(report, baseline, tolerance):
+    """
+    print results next to the baseline and return the list of slower ones
+
+    >>> compare({"results": {"op": {"10": 3.0}}},
+    ...         {"results": {"op": {"10": 2.0}}}, 1.25)
+    op                            10    3000.000 ms    2000.000 ms  1.50x !
+    [('op', '10')]
+    """
+    slower = []
+    for operation, times in report["results"].items():
+        base_times = baseline["results"].get(operation, {})
+        for size, seconds in times.items():
+            base = base_times.get(size)
+            if base is None:
+                print(f"{operation:24} {size:>7} {seconds*1e3:11.3f} ms")
+                continue
+            ratio = seconds / base if base else float("inf")
+            mark = " !" if ratio > tolerance else ""
+            if mark:
+                slower.append((operation, size))
+            print(f"{operation:24} {size:>7} {seconds*1e3:11.3f} ms "
+                  f"{base*1e3:11.3f} ms {ratio:5.2f}x{mark}")
+    return slower
+
+
+def show(report):
+    """ print results """
+    for operation, times in report["results"].items():
+        for size, seconds in times.items():
+            print(f"{operation:24} {size:>7} {seconds*1e3:11.3f} ms")
+
+
+if __name__ == '__main__':
+
+    appargs.read_appargs({}, [])
+    REPORT = run(ARGS.sizes, ARGS.repeat, ARGS.only)
+
+    if ARGS.baseline:
+        with open(ARGS.baseline, encoding="utf-8") as file:
+            SLOWER = compare(REPORT, json.load(file), ARGS.tolerance)
+    else:
+        SLOWER = []
+        show(REPORT)
+
+    if ARGS.output:
+        with open(ARGS.output, "w", encoding="utf-8") as file:
+            json.dump(REPORT, file, indent=2)
+            file.write("\n")
+
+    sys.exit(1 if SLOWER else 0)
@@ -0,0 +1,126 @@
+#!/usr/bin/python3
+
+# sorted_insert.py
+#
+# Copyright:
+#   Copyright (C) 2024-2025 Bernd Schumacher <bernd@bschu.de>
+#
+# License: GPL-3.0+
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#   .
+#   This package is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#   .
+#   You should have received a copy of the GNU General Public License
+#   along with this program. If not, see <https://www.gnu.org/licenses/>.
+# Comment:
+#   On Debian systems, the complete text of the GNU General
+#   Public License version 3 can be found in
+#   "/usr/share/common-licenses/GPL-3".
+
+"""
+compare the former linear DataList.add_item_sorted with the rank based
+binary search, when unpicking an item into a sorted plus list
+"""
+
+import sys
+import os
+import timeit
+
+dir1 = os.path.dirname(os.path.realpath(__file__))
+dir2 = os.path.dirname(dir1)
+dir3 = os.path.dirname(dir2)
+sys.path.append(dir3)
+
+# no display is needed, unless CASHBOX_BACKEND=gi is given
+os.environ.setdefault("CASHBOX_BACKEND", "python")
+
+try:
+    from cashbox.backend import Object, Property, ListStore
+    from cashbox.data_list import DataList
+except ImportError as exc:
+    print('Error: cashbox modules not found.', exc)
+    sys.exit(1)
+
+
+class Data(Object):
+    """ Benchmark Data """
+    # pylint: disable=too-few-public-methods
+    count = Property(type=int)
+
+    def __init__(self, count=0):
+        super().__init__()
+        self.count = count
+
+
+def linear_add_item_sorted(item, plus_list, order_list):
+    """ DataList.add_item_sorted before ranks were used """
+    is_break = False
+    plus_i = 0
+    order_i = 0
+
+    if len(plus_list) >= 1 and not plus_list[0] in order_list:
+        # special item1 used
+        plus_i = 1
+
+    while plus_i < len(plus_list):
+        plus_item = plus_list[plus_i]
+        while order_i < len(order_list):
+            order_item = order_list[order_i]
+            if order_item == item:
+                is_break = True
+                break
+            if order_item == plus_item:
+                break
+            order_i += 1
+        if is_break:
+            break
+        plus_i += 1
+    plus_list.insert(plus_i, item)
+
+
+def bench(size, number):
+    """ return seconds per unpick for both implementations """
+    # linear: unpicked items are a sorted plus list with a header item
+    order_list = ListStore()
+    items = [Data() for _ in range(size)]
+    order_list.splice(0, 0, items)
+    plus_list = ListStore()
+    plus_list.splice(0, 0, [Data(-1)] + items)
+    item = items[-2]
+
+    def linear():
+        _found, pos = plus_list.find(item)
+        plus_list.remove(pos)
+        linear_add_item_sorted(item, plus_list, order_list)
+
+    linear_time = timeit.timeit(linear, number=number) / number
+
+    # ranks: the same with a DataList
+    data_list = DataList()
+    data_list.add_plus_list(pick=lambda data: data.count == 0, sort=True,
+                            item1=Data(-1))
+    for _ in range(size):
+        data_list.main_list.append(Data())
+    item = data_list.main_list[size-2]
+
+    def ranks():
+        item.count = 1
+        item.count = 0
+
+    rank_time = timeit.timeit(ranks, number=number) / number
+    return linear_time, rank_time
+
+
+if __name__ == '__main__':
+
+    for n in [100, 1000, 10000]:
+        (t_linear, t_rank) = bench(n, 20)
+        print(f"{n:6} items: linear {t_linear*1e3:9.3f} ms  "
+              f"rank {t_rank*1e3:9.3f} ms  "
+              f"gain {t_linear/t_rank:8.1f}x")
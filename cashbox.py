@@ -39,6 +39,7 @@ if dirp == "decision":
 
 try:
     from cashbox.article import Sale
+    from cashbox.column_sale import ColumnSale
     from cashbox.sale_widget import SaleWidget
     from cashbox.view_switch_window import ViewSwitchWindow
     from cashbox.receipt_widget import ReceiptWidget
@@ -65,15 +66,19 @@ class MyApp(App):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.last_child_name = None
-
-        # sale
-        self.sale = Sale()
-
+        self.sale = None
         self.pricelist_widget = None
 
     def on_activate(self, app):
         win = ViewSwitchWindow(application=app)
 
+        if appargs.compact:
+            # articles are kept in columns, for large price lists
+            self.sale = ColumnSale()
+        else:
+            # sale, plus lists are updated once per main loop iteration
+            self.sale = Sale(coalesce=True)
+
         # PricelistWidget
         box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, margin_top=12,
                       margin_end=12, margin_bottom=12, margin_start=12,
@@ -0,0 +1,901 @@
+#!/usr/bin/python3
+
+# column_sale.py
+#
+# Copyright:
+#   Copyright (C) 2024-2025 Bernd Schumacher <bernd@bschu.de>
+#
+# License: GPL-3.0+
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#   .
+#   This package is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#   .
+#   You should have received a copy of the GNU General Public License
+#   along with this program. If not, see <https://www.gnu.org/licenses/>.
+# Comment:
+#   On Debian systems, the complete text of the GNU General
+#   Public License version 3 can be found in
+#   "/usr/share/common-licenses/GPL-3".
+
+"""
+column_sale.py provides class ColumnSale, a compact Sale for large price
+lists.
+
+Names, prices and counts of all lines are kept in array columns. A line
+keeps its row of the columns, while lines before it are inserted or
+removed, so a change of some lines only changes their rows. The lists of
+a ColumnSale (main_list, picked, unpicked, drop_unpicked) are list
+models, that contain only rows. An Article or Comment is created when a
+widget asks for an item and is cached as long as it is used. Changes of
+a cached Article are written back to the columns.
+"""
+
+import sys
+import os
+import weakref
+from array import array
+from contextlib import contextmanager
+
+dir1 = os.path.dirname(os.path.realpath(__file__))
+dir2 = os.path.dirname(dir1)
+sys.path.append(dir2)
+
+try:
+    from cashbox.backend import BACKEND, ListModel
+    from cashbox.data_list import OrderIndex, call_weak_method
+    from cashbox.article import (Article, Comment, DropDownHead, Sale,
+                                 Orders, Totals, Transaction, cents2strs,
+                                 raise_cents, round_cents, write_lines,
+                                 item_value)
+    from cashbox.read_appargs import appargs
+    from cashbox.locale_utils import _
+except ImportError as exc:
+    print('Error: cashbox modules not found.', exc)
+    sys.exit(1)
+
+# kinds of rows
+ARTICLE = 0
+COMMENT = 1
+
+
+class Columns():
+    """
+    all lines of a price list, one array per property. The rows of
+    removed lines are used again by new lines.
+    """
+
+    def __init__(self):
+        self.kinds = array("B")
+        self.names = []  # article name or comment
+        self.prices = array("q")
+        self.counts = array("q")
+        self.sold = array("q")
+        self.free = []  # rows without a line
+
+    def column(self, field):
+        """ column of a property """
+        return {"name": self.names, "comment": self.names,
+                "price": self.prices, "count": self.counts,
+                "sold": self.sold}[field]
+
+    def add(self, values):
+        """ write item_value()s to free or new rows and return the rows """
+        n_free = min(len(self.free), len(values))
+        rows = self.free[len(self.free) - n_free:]
+        del self.free[len(self.free) - n_free:]
+        for (row, (article, name, price, count)) in zip(rows, values):
+            self.kinds[row] = ARTICLE if article else COMMENT
+            self.names[row] = name
+            self.prices[row] = price
+            self.counts[row] = count
+            self.sold[row] = 0
+        start = len(self.kinds)
+        values = values[n_free:]
+        self.kinds.extend(ARTICLE if value[0] else COMMENT
+                          for value in values)
+        self.names.extend(value[1] for value in values)
+        self.prices.extend(value[2] for value in values)
+        self.counts.extend(value[3] for value in values)
+        self.sold.extend([0] * len(values))
+        return rows + list(range(start, start + len(values)))
+
+    def remove(self, rows):
+        """ free the rows of removed lines """
+        for row in rows:
+            self.names[row] = None
+        self.free.extend(rows)
+
+    def amount(self, rows):
+        """ (cents, count) of rows """
+        (prices, counts) = (self.prices, self.counts)
+        return (sum(prices[row] * counts[row] for row in rows),
+                sum(counts[row] for row in rows))
+
+    def values(self, rows):
+        """ item_value() of rows """
+        return [(self.kinds[row] == ARTICLE, self.names[row],
+                 self.prices[row], self.counts[row]) for row in rows]
+
+    def lines(self, rows, block=1024):
+        """
+        text of rows, like Article.text() and Comment.text().
+        Prices are formatted block rows at a time.
+        """
+        for start in range(0, len(rows), block):
+            part = rows[start:start + block]
+            prices = cents2strs([self.prices[row] for row in part])
+            for (row, price) in zip(part, prices):
+                (name, count) = (self.names[row], self.counts[row])
+                if self.kinds[row] == COMMENT:
+                    yield name
+                elif count:
+                    yield f"{name} {price} {count}"
+                else:
+                    yield f"{name} {price}"
+
+
+class RowView(ListModel):
+    """
+    list model of some rows of a ColumnSale.
+    Only rows are stored, items are created by ColumnSale.item().
+    """
+    __slots__ = ("sale", "pick", "sort", "sort_fields", "index", "item1",
+                 "offset")
+
+    def __init__(self, sale, pick, sort=None, sort_fields=None, item1=None):
+        """
+        pick  function(row): True if the row belongs to the view
+        sort  None: new rows are added to the end
+              function(row): order key of a row
+        """
+        super().__init__()
+        self.sale = sale
+        self.pick = pick
+        self.sort = sort
+        self.sort_fields = sort_fields or set()
+        self.index = OrderIndex()
+        self.item1 = item1
+        self.offset = 1 if item1 else 0
+
+    # the vfuncs of Gio.ListModel can not be overwritten by subclasses
+    def do_get_n_items(self):
+        """ Gio.ListModel.get_n_items() """
+        return self.n_items()
+
+    def do_get_item(self, pos):
+        """ Gio.ListModel.get_item() """
+        return self.item_at(pos)
+
+    def n_items(self):
+        """ number of items """
+        return len(self.index) + self.offset
+
+    def item_at(self, pos):
+        """ item at position pos or None """
+        if pos < self.offset:
+            return self.item1
+        if pos - self.offset >= len(self.index):
+            return None
+        return self.sale.item(self.index.items[pos - self.offset])
+
+    def rows(self):
+        """ rows in the order of the view """
+        return self.index.items
+
+    def order_key(self, row):
+        """ equal sort keys keep the order of the price list """
+        return (self.sort(row), self.sale.index.key[row])
+
+    def add(self, row):
+        """ add row at its position """
+        if self.sort is None:
+            pos = len(self.index)
+            self.index.insert(row, pos)
+        else:
+            pos = self.index.insert_key(row, self.order_key(row))
+        self.items_changed(pos + self.offset, 0, 1)
+
+    def remove(self, row):
+        """ remove row """
+        self.items_changed(self.index.remove(row) + self.offset, 1, 0)
+
+    def update(self, row, field):
+        """ row changed field """
+        found = row in self.index
+        if self.pick(row):
+            if not found:
+                self.add(row)
+            elif field in self.sort_fields:
+                old = self.index.remove(row)
+                new = self.index.insert_key(row, self.order_key(row))
+                if new != old:
+                    self.items_changed(old + self.offset, 1, 0)
+                    self.items_changed(new + self.offset, 0, 1)
+        elif found:
+            self.remove(row)
+
+    def reset(self, rows):
+        """
+        replace all rows, e.g. after many rows have been inserted or
+        removed. rows are the former rows in the order of the view.
+        """
+        lines = self.sale.index
+        rows = [row for row in rows if row in lines and self.pick(row)]
+        if self.sort is None:
+            seen = set(rows)
+            rows += [row for row in lines.items
+                     if row not in seen and self.pick(row)]
+            keys = None
+        else:
+            rows = sorted((row for row in lines.items if self.pick(row)),
+                          key=self.order_key)
+            keys = [self.order_key(row) for row in rows]
+        n_items = len(self.index)
+        self.index.reset(rows, keys)
+        if n_items or rows:
+            self.items_changed(self.offset, n_items, len(rows))
+
+    def replace_rows(self, removed, added, many, rekey):
+        """
+        the rows <removed> have been replaced by the rows <added>. Only
+        these rows are removed and added, many changes are shown at once.
+        rekey: the rows got new order keys in the price list
+        """
+        if many:
+            self.reset(self.index.items)
+            return
+        for row in removed:
+            if row in self.index:
+                self.remove(row)
+        if rekey and self.sort is not None:
+            self.index.rekey(lambda row, _key: self.order_key(row))
+        for row in added:
+            if self.pick(row):
+                self.add(row)
+
+
+class MainView(RowView):
+    """ list model of all rows, that can be changed like a Gio.ListStore """
+    __slots__ = ()
+
+    def __init__(self, sale):
+        super().__init__(sale, pick=lambda row: True)
+        # the rows of the price list in their order
+        self.index = sale.index
+
+    def update(self, row, field):
+        """ the rows of main_list do not change """
+
+    def values(self, start, end):
+        """ item_value() of the items from start to end """
+        return self.sale.columns.values(self.index.items[start:end])
+
+    def set_values(self, pos, value):
+        """ change the item at pos in place to value of the same kind """
+        self.sale.set_values(self.index.items[pos], value)
+
+    def splice_values(self, pos, n_removals, values):
+        """ replace n_removals items at pos with new items of values """
+        self.sale.change_rows(pos, n_removals, values)
+
+    def reset(self, rows):
+        """ main_list has been changed by splice """
+
+    def replace_rows(self, removed, added, many, rekey):
+        """ ColumnSale.change_rows emits the changes of main_list """
+
+    def find(self, item):
+        """ return (found, position) like Gio.ListStore.find() """
+        row = self.sale.item_row.get(item)
+        if row is None:
+            return (False, 0)
+        return self.index.find(row)
+
+    def splice(self, pos, n_removals, additions):
+        """ replace n_removals items at pos with additions """
+        self.sale.splice(pos, n_removals, list(additions))
+
+    def append(self, item):
+        """ append item """
+        self.splice(len(self.index), 0, [item])
+
+    def insert(self, pos, item):
+        """ insert item at pos """
+        self.splice(pos, 0, [item])
+
+    def remove(self, row):
+        """ remove item at row, rows of main_list are its positions """
+        self.splice(row, 1, [])
+
+    def remove_all(self):
+        """ remove all items """
+        self.splice(0, len(self.index), [])
+
+
+class ColumnSale():
+    """
+    A Sale with the same interface as Sale, that keeps all lines in
+    Columns instead of one Article per line.
+
+    Differences to Sale: unpicked has the order of the price list, and
+    there are no more plus lists than those of Sale.
+    """
+    # the same interface as Sale, with indexes of the rows
+    # pylint: disable=too-many-instance-attributes,too-many-public-methods
+
+    DROP_ORDERS = Sale.DROP_ORDERS
+
+    def __init__(self):
+        self.columns = Columns()
+        # rows of the lines in the order of the price list
+        self.index = OrderIndex()
+
+        # row -> cached Article or Comment, while it is used
+        self.items = weakref.WeakValueDictionary()
+        # cached Article or Comment -> row
+        self.item_row = weakref.WeakKeyDictionary()
+        # cached Article or Comment -> id of its signal handler
+        self.handlers = weakref.WeakKeyDictionary()
+        self.weak_on_item_changed = weakref.WeakMethod(self.on_item_changed)
+
+        # name -> rows of Articles with this name
+        self.names = {}
+        # totals are changed by each price and count change
+        self.totals = Totals()
+        # open orders, the counts of the current one are in the columns
+        self.orders = Orders(Transaction())
+
+        columns = self.columns
+        self.main_list = MainView(self)
+        self.picked = RowView(self, pick=lambda row: columns.counts[row] > 0)
+        self.unpicked = RowView(self, pick=self.is_unpicked_row,
+                                sort=lambda row: 0)
+        self.drop_unpicked = RowView(self, pick=self.is_unpicked_row,
+                                     sort=lambda row: 0,
+                                     item1=DropDownHead(_("select article")))
+        self.views = [self.main_list, self.picked, self.unpicked,
+                      self.drop_unpicked]
+        self.drop_unpicked_orders = {"pricelist": self.drop_unpicked}
+
+    def is_unpicked_row(self, row):
+        """ Articles may be unpicked """
+        return (self.columns.kinds[row] == ARTICLE and
+                self.columns.counts[row] == 0)
+
+    def str(self, data_list):
+        """ return string of part of data_list """
+        return "[" + ",".join([str(data) for data in data_list]) + "]"
+
+    def __str__(self):
+        return self.str(self.main_list)
+
+    def item(self, row):
+        """ return the Article or Comment of row, create it if needed """
+        item = self.items.get(row)
+        if item is None:
+            columns = self.columns
+            if columns.kinds[row] == ARTICLE:
+                item = Article(columns.names[row], columns.prices[row],
+                               columns.counts[row])
+                item.sold = columns.sold[row]
+            else:
+                item = Comment(columns.names[row])
+            self.cache(item, row)
+        return item
+
+    def cache(self, item, row):
+        """ remember item of row and write its changes to the columns """
+        self.items[row] = item
+        self.item_row[item] = row
+        self.handlers[item] = item.connect("notify", call_weak_method,
+                                           self.weak_on_item_changed)
+
+    def on_item_changed(self, item, pspec):
+        """ write changes of a cached item to the columns """
+        row = self.item_row.get(item)
+        if row is not None and pspec.name in ("name", "comment", "price",
+                                              "count", "sold"):
+            self.set_column(row, pspec.name, getattr(item, pspec.name))
+
+    def set_column(self, row, field, value):
+        """ change field of row and update all views """
+        columns = self.columns
+        column = columns.column(field)
+        old = column[row]
+        if old == value:
+            return
+        column[row] = value
+        if field == "price":
+            self.totals.add((value - old) * columns.counts[row], 0)
+        elif field == "count":
+            self.totals.add((value - old) * columns.prices[row],
+                            value - old)
+        elif field == "name" and columns.kinds[row] == ARTICLE:
+            self.del_name(row, old)
+            self.add_name(row, value)
+        for view in self.views:
+            view.update(row, field)
+
+    def set_value(self, row, field, value):
+        """ change field of row, also in its cached item """
+        item = self.items.get(row)
+        if item is not None:
+            # on_item_changed changes the column
+            setattr(item, field, value)
+        else:
+            self.set_column(row, field, value)
+
+    def set_values(self, row, value):
+        """
+        change the line of row in place to value, an item_value() of the
+        same kind
+        """
+        (article, name, price, count) = value
+        fields = ((("name", name), ("price", price), ("count", count))
+                  if article else (("comment", name),))
+        for (field, new) in fields:
+            if self.columns.column(field)[row] != new:
+                self.set_value(row, field, new)
+
+    def add_name(self, row, name):
+        """ add row to the name index """
+        self.names.setdefault(name, []).append(row)
+
+    def del_name(self, row, name):
+        """ remove row from the name index """
+        rows = self.names[name]
+        rows.remove(row)
+        if not rows:
+            del self.names[name]
+
+    def splice(self, pos, removed, items):
+        """
+        replace <removed> lines at pos with items, that are used as the
+        cached items of their rows
+        """
+        self.change_rows(pos, removed, [item_value(item) for item in items],
+                         items)
+
+    def change_rows(self, pos, removed, values, items=()):
+        """
+        replace <removed> lines at pos with new rows of values, the
+        item_value()s of the new lines. Only these rows are changed, in
+        the name index and in the views. Articles of removed rows leave
+        all orders, new Articles get the counts of other orders by name,
+        so the counts survive e.g. a line, that is invalid for a while.
+        items are cached for the new rows, if they are given.
+        """
+        columns = self.columns
+        old = self.index.items[pos:pos + removed]
+        self.release_rows(old)
+        old_amount = columns.amount(old)
+
+        new = columns.add(values)
+        self.cache_rows(new, items)
+        many = (removed + len(new)) * 8 > len(self.index)
+        renumbered = self.index.renumbered
+        self.index.replace(pos, removed, new)
+        new_amount = columns.amount(new)
+        self.totals.add(new_amount[0] - old_amount[0],
+                        new_amount[1] - old_amount[1])
+        self.name_rows(new)
+
+        self.main_list.items_changed(pos, removed, len(new))
+        rekey = self.index.renumbered != renumbered
+        for view in self.views:
+            view.replace_rows(old, new, many, rekey)
+        columns.remove(old)
+
+    def release_rows(self, rows):
+        """
+        remove rows from the name index and drop their cached items, the
+        Articles of them leave all orders
+        """
+        columns = self.columns
+        for row in rows:
+            item = self.items.pop(row, None)
+            if item is not None:
+                del self.item_row[item]
+                item.disconnect(self.handlers.pop(item))
+                if isinstance(item, Article):
+                    self.orders.leave(item)
+            if columns.kinds[row] == ARTICLE:
+                self.del_name(row, columns.names[row])
+
+    def cache_rows(self, rows, items):
+        """ use items as the cached items of new rows """
+        for (row, item) in zip(rows, items):
+            if isinstance(item, Article):
+                self.columns.sold[row] = item.sold
+            if item in self.handlers:
+                item.disconnect(self.handlers.pop(item))
+            self.cache(item, row)
+
+    def name_rows(self, rows):
+        """
+        add new rows to the name index, their Articles get the counts of
+        other orders by name
+        """
+        columns = self.columns
+        for row in rows:
+            if columns.kinds[row] == ARTICLE:
+                self.add_name(row, columns.names[row])
+                if columns.names[row] in self.orders.left:
+                    self.orders.rejoin(self.item(row))
+
+    def replace_all(self, items):
+        """ replace all items of main_list """
+        self.splice(0, len(self.index), list(items))
+
+    def clear(self):
+        """ delete items """
+        self.replace_all([])
+
+    @contextmanager
+    def batch(self):
+        """ views are updated at once, batch is only kept for Sale """
+        yield self
+
+    def flush(self):
+        """ views are always up to date """
+
+    def text(self):
+        """
+        This will make Sale ediable as text.
+        Only the columns are used, no Article is created.
+        """
+        return "\n".join(self.iter_lines())
+
+    def iter_lines(self):
+        """ lines of text(), one by one """
+        return self.columns.lines(self.index.items)
+
+    def write_to(self, fileobj, chunk=256):
+        """ write text() to fileobj, without building the whole text """
+        write_lines(self.iter_lines(), fileobj, chunk)
+
+    def get_article(self, name, picked=None):
+        """
+        get article with given name or None.
+        If more articles have the same name, the first one is used.
+        picked:
+          None: no matter if picked
+          False: not picked
+          True: picked
+        """
+        found = None
+        rows = self.names.get(name)
+        if rows:
+            row = min(rows, key=self.index.key.__getitem__)
+            count = self.columns.counts[row]
+            if (picked is None or (picked is True and count > 0) or
+                    (picked is False and count == 0)):
+                found = self.item(row)
+        return found
+
+    def drop_unpicked_by(self, order):
+        """ return drop_unpicked in one of the DROP_ORDERS """
+        if order not in self.drop_unpicked_orders:
+            columns = self.columns
+            sort = {"name": lambda row: columns.names[row].casefold(),
+                    "price": lambda row: columns.prices[row],
+                    "sold": lambda row: -columns.sold[row]}[order]
+            view = RowView(self, pick=self.is_unpicked_row, sort=sort,
+                           sort_fields=self.DROP_ORDERS[order][2],
+                           item1=DropDownHead(_("select article")))
+            view.reset([])
+            self.views.append(view)
+            self.drop_unpicked_orders[order] = view
+        return self.drop_unpicked_orders[order]
+
+    def add_sold(self):
+        """
+        add count of the picked Articles to sold, when the sale is done
+        """
+        columns = self.columns
+        for row in list(self.picked.rows()):
+            self.set_value(row, "sold",
+                           columns.sold[row] + columns.counts[row])
+
+    @property
+    def transaction(self):
+        """ Transaction of the current customer """
+        transaction = Transaction()
+        for row in self.picked.rows():
+            transaction.set(self.item(row), self.columns.counts[row])
+        return transaction
+
+    def next_customer(self):
+        """
+        start with a new customer, without picked articles.
+        Only the picked rows are changed. Return the former Transaction.
+        """
+        transaction = self.transaction
+        for row in list(self.picked.rows()):
+            self.set_value(row, "count", 0)
+        return transaction
+
+    def count_zero(self):
+        """
+        e.g. start with a new customer, without picked articles
+        """
+        self.next_customer()
+
+    def change_prices(self, function):
+        """
+        change the prices of all Articles in one pass over the price
+        column, then update the totals and the views sorted by price once.
+        """
+        columns = self.columns
+        rows = [row for row in self.index.items
+                if columns.kinds[row] == ARTICLE]
+        prices = function([columns.prices[row] for row in rows])
+        cents = 0
+        changed = []
+        for (row, price) in zip(rows, prices):
+            if columns.prices[row] != price:
+                cents += (price - columns.prices[row]) * columns.counts[row]
+                columns.prices[row] = price
+                changed.append(row)
+        if not changed:
+            return
+        self.totals.add(cents, 0)
+        for view in self.views:
+            if "price" in view.sort_fields:
+                view.reset(view.rows())
+        # cached items get the new price, the columns are already equal
+        for row in changed:
+            item = self.items.get(row)
+            if item is not None:
+                item.price = columns.prices[row]
+
+    def raise_prices(self, percent):
+        """ raise all prices by percent """
+        self.change_prices(lambda prices: raise_cents(prices, percent))
+
+    def round_prices(self, step):
+        """ round all prices to a multiple of step cents """
+        self.change_prices(lambda prices: round_cents(prices, step))
+
+    def switch_order(self, pos):
+        """
+        show the order at pos. The counts of the former order are kept in
+        its Transaction, only picked rows are changed.
+        """
+        orders = self.orders
+        if pos == orders.current:
+            return
+        orders.transactions[orders.current] = self.next_customer()
+        transaction = orders.transactions[pos]
+        orders.transactions[pos] = Transaction()
+        for (item, count) in transaction.counts.items():
+            row = self.item_row.get(item)
+            if row is not None:
+                self.set_value(row, "count", count)
+        orders.current = pos
+
+    def new_order(self):
+        """ open a new order without picked Articles and show it """
+        pos = self.orders.append(Transaction())
+        self.switch_order(pos)
+        return pos
+
+    def close_order(self):
+        """
+        close the current order, e.g. after its receipt, and show the
+        former order. The last order stays open without picked Articles.
+        """
+        self.next_customer()
+        closed = self.orders.current
+        if self.orders.size > 1:
+            self.switch_order(closed - 1 if closed else 1)
+            self.orders.remove(closed)
+
+
+if __name__ == '__main__':
+
+    import gc
+    import io
+    import random
+    from cashbox.article import reconcile
+
+    if BACKEND == "gi":
+        from cashbox.app import App
+        App().run(sys.argv)
+    else:
+        appargs.read_appargs({}, [])
+    shop = ColumnSale()
+
+    for d in [Comment("one two three"), Article("Banana", 110, 1),
+              Article("Apple", 200, 2), Article("Strawberry", 250, 3),
+              Article("Pear", 335, 4), Article("Watermelon", 100, 5),
+              Comment("four,five six"), Article("Blueberry", 200, 6)]:
+        shop.main_list.append(d)
+    assert f"{shop}" == "[one two three,(Banana,1.10,1),(Apple,2.00,2)," + \
+                        "(Strawberry,2.50,3),(Pear,3.35,4)," + \
+                        "(Watermelon,1.00,5),four,five six,(Blueberry,2.00,6)]"
+    assert f"{shop.text()}" == """one two three
+Banana 1.10 1
+Apple 2.00 2
+Strawberry 2.50 3
+Pear 3.35 4
+Watermelon 1.00 5
+four,five six
+Blueberry 2.00 6"""
+
+    a = shop.get_article("Apple", picked=True)
+    a.count = 0
+    assert f"{shop.get_article('Apple', picked=True)}" == "None"
+    assert f"{shop.get_article('Apple', picked=False)}" == "(Apple,2.00,0)"
+    assert shop.str(shop.drop_unpicked) == "[DropDownHead=<" + \
+        _("select article") + ">,(Apple,2.00,0)]"
+    a.count = 3
+    assert f"{shop.get_article('Apple', picked=True)}" == "(Apple,2.00,3)"
+    assert shop.str(shop.picked).endswith(
+        ",(Blueberry,2.00,6),(Apple,2.00,3)]")
+
+    a.price = 210
+    a.name = "Green Apple"
+    assert f"{shop.get_article('Green Apple', picked=True)}" == \
+        "(Green Apple,2.10,3)"
+    assert shop.get_article("Apple") is None
+    assert shop.totals.total_cents == sum(a.price * a.count
+                                          for a in shop.picked)
+    assert shop.totals.total_items == 3 + 1 + 3 + 4 + 5 + 6
+
+    # drop_unpicked in other orders
+    by_name = shop.drop_unpicked_by("name")
+    most_sold = shop.drop_unpicked_by("sold")
+    shop.add_sold()
+    shop.count_zero()
+    assert len(shop.picked) == 0
+    assert [d.name for d in list(by_name)[1:]] == [
+        "Banana", "Blueberry", "Green Apple", "Pear", "Strawberry",
+        "Watermelon"]
+    assert [d.name for d in list(most_sold)[1:]] == [
+        "Blueberry", "Watermelon", "Pear", "Green Apple", "Strawberry",
+        "Banana"]
+    shop.get_article("Banana").count = 10
+    shop.add_sold()
+    done = shop.next_customer()
+    assert list(most_sold)[1].name == "Banana"
+    assert len(done) == 1 and len(shop.transaction) == 0
+
+    # inserts and removals keep cached items and their rows
+    pear = shop.get_article("Pear")
+    pear_row = shop.item_row[pear]
+    shop.main_list.insert(0, Comment("# new"))
+    shop.main_list.remove(2)
+    assert shop.main_list.find(pear) == (True, 4)
+    assert shop.item_row[pear] == pear_row
+    pear.count = 2
+    assert shop.text().splitlines()[4] == "Pear 3.35 2"
+    assert list(shop.picked) == [pear]
+    shop.count_zero()
+
+    # bulk price changes write the price column in one pass
+    by_price = shop.drop_unpicked_by("price")
+    pear.count = 1
+    shop.raise_prices(10)
+    shop.round_prices(50)
+    assert pear.price == 350 and shop.totals.total_cents == 350
+    assert shop.text().splitlines()[4] == "Pear 3.50 1"
+    assert [a.price for a in list(by_price)[1:]] == sorted(
+        a.price for a in shop.unpicked)
+    shop.count_zero()
+
+    # open orders keep their counts while another order is shown
+    pear.count = 1
+    assert shop.new_order() == 1 and len(shop.picked) == 0
+    shop.get_article("Blueberry").count = 2
+    shop.switch_order(0)
+    assert list(shop.picked) == [pear] and shop.totals.total_cents == 350
+    shop.close_order()
+    assert shop.orders.size == 1 and shop.get_article("Blueberry").count == 2
+    shop.close_order()
+    assert len(shop.picked) == 0 and shop.totals.total_items == 0
+
+    stream = io.StringIO()
+    shop.write_to(stream, 3)
+    assert stream.getvalue() == shop.text()
+
+    # a large price list is kept in the columns, not in Articles
+    shop.replace_all([Article(f"a{i}", i, int(i % 100 == 0))
+                      for i in range(10000)])
+    gc.collect()
+    assert len(shop.items) < 200
+    assert len(shop.picked) == 100 and len(shop.drop_unpicked) == 9901
+    assert shop.get_article("a5000").price == 5000
+    shop.drop_unpicked[1].count = 1
+    assert len(shop.picked) == 101 and shop.picked[100].name == "a1"
+    assert shop.text().splitlines()[1] == "a1 0.01 1"
+    assert shop.totals.total_items == 101
+    assert shop.totals.total_cents == sum(range(0, 10000, 100)) + 1
+    shop.count_zero()
+    assert shop.totals.total_cents == 0
+    assert len(shop.drop_unpicked) == 10001
+    assert list(by_name)[1].name == "a0"
+    assert list(shop.drop_unpicked_by("price"))[1:3] == list(
+        shop.main_list)[:2]
+
+    # reconcile changes rows in place and only creates changed items
+    a1 = shop.main_list[1]
+    gc.collect()
+    assert reconcile(shop.main_list, 0, 10000, [
+        (True, f"a{i}", i + (i == 1), 0) for i in range(10000)
+        if i != 5000]) == 1
+    assert shop.main_list[1] is a1 and a1.price == 2
+    assert len(shop.items) < 200 and len(shop.main_list) == 9999
+    assert shop.get_article("a5000") is None
+
+    # a new line only changes one row of each view
+    shop.get_article("a3").count = 1
+    changes = []
+    for shop_view in shop.views:
+        shop_view.connect("items-changed",
+                          lambda _view, *change: changes.append(change))
+    assert reconcile(shop.main_list, 2, 0, [(True, "a1b", 7, 0)]) == 1
+    assert changes and all(removed + added == 1
+                           for (_pos, removed, added) in changes)
+    assert shop.main_list[3].name == "a2" and shop.picked[0].name == "a3"
+    assert [d.name for d in list(by_name)[1:]] == sorted(
+        d.name for d in shop.unpicked)
+    names = {}
+    for (line_nr, line_item) in enumerate(shop.main_list):
+        names.setdefault(line_item.name, []).append(line_nr)
+    assert names == {name: sorted(shop.main_list.index.find(row)[1]
+                                  for row in rows)
+                     for (name, rows) in shop.names.items()}
+
+    # the counts of an Article, whose line is invalid for a while, are
+    # back in every order, when the line is valid again
+    shop.new_order()
+    shop.get_article("a3").count = 2
+    reconcile(shop.main_list, 4, 1, [(False, "a3 0.0x 2", 0, 0)])
+    assert len(shop.orders.transactions[0]) == 0
+    assert shop.totals.total_items == 0
+    reconcile(shop.main_list, 4, 1, [(True, "a3", 3, 2)])
+    assert shop.get_article("a3").count == 2
+    shop.switch_order(0)
+    assert shop.get_article("a3").count == 1 and len(shop.picked) == 1
+    assert shop.totals.total_items == 1
+
+    # random changes give the same lines, views and totals as a Sale
+    rnd = random.Random(1)
+    (shop, reference) = (ColumnSale(), Sale())
+    shop_by_price = shop.drop_unpicked_by("price")
+    reference_by_price = reference.drop_unpicked_by("price")
+    for change in range(400):
+        length = len(reference.main_list)
+        at = rnd.randint(0, length)
+        n_removed = rnd.randint(0, min(length - at, rnd.choice([2, 50])))
+        new_lines = [(True, f"n{rnd.randint(0, 40)}",
+                      rnd.randint(0, 9) * 10, rnd.choice([0, 0, 1, 2]))
+                     if rnd.random() < 0.8 else
+                     (False, f"# {rnd.randint(0, 3)}", 0, 0)
+                     for _ in range(rnd.choice([0, 1, 2, 3, 40]))]
+        for some_sale in (shop, reference):
+            reconcile(some_sale.main_list, at, n_removed, new_lines)
+            counted = some_sale.get_article(f"n{change % 41}")
+            if counted is not None:
+                counted.count = change % 3
+        assert shop.text() == reference.text(), change
+        assert (sorted(map(str, shop.picked)) ==
+                sorted(map(str, reference.picked)))
+        assert list(map(str, shop.unpicked)) == [
+            str(item) for item in reference.main_list
+            if isinstance(item, Article) and item.count == 0]
+        assert (list(map(str, shop_by_price)) ==
+                list(map(str, reference_by_price)))
+        assert (shop.totals.total_cents, shop.totals.total_items) == (
+            reference.totals.total_cents, reference.totals.total_items)
+    assert len(shop.columns.names) - len(shop.columns.free) == len(
+        shop.main_list)
+
+    print("all asserts have been ok")
@@ -35,12 +35,45 @@ sys.path.append(dir1)
 
 try:
     from cashbox.read_appargs import appargs
-    from cashbox.app import App
+    from cashbox.backend import BACKEND
 except ImportError as exc:
     print('Error: cashbox modules not found.', exc)
     sys.exit(1)
 
 
+class Part():
+    """
+    some groups of a match of a whole line, used like the match of this
+    part of the line alone. Positions are shifted by offset, group 0 is
+    the span from start to end.
+    """
+    __slots__ = ("match", "first", "span0", "offset")
+
+    def __init__(self, match, first, span0, offset=0):
+        self.match = match
+        self.first = first  # group of the match, that is group 1
+        self.span0 = span0
+        self.offset = offset
+
+    def start(self, group=0):
+        """ like re.Match.start() """
+        if group == 0:
+            return self.span0[0] + self.offset
+        pos = self.match.start(self.first + group - 1)
+        return pos + self.offset if pos >= 0 else pos
+
+    def end(self, group=0):
+        """ like re.Match.end() """
+        if group == 0:
+            return self.span0[1] + self.offset
+        pos = self.match.end(self.first + group - 1)
+        return pos + self.offset if pos >= 0 else pos
+
+    def span(self, group=0):
+        """ like re.Match.span() """
+        return (self.start(group), self.end(group))
+
+
 class Cshbx():
     """
     a text line with an article needs an article name and and a price
@@ -56,19 +89,68 @@ class Cshbx():
 
     def compile_re(self):
         """ compile regular expressions """
-        re_price = (r'(\$\s*|\€\s*|)(\d+)(,|\.)(\d\d)'
-                    r'(\s*\$|\s*€|\s*Dollar|\s*Euro|)')
-        re_name = r'(\s*)(.*\S)(\s+)'
+        # the digits of a price do not start inside other digits, unless
+        # they follow the cents of a price before. finditer finds the same
+        # prices, but does not try each position of a long run of digits.
+        re_price = (r'(\$\s*|\€\s*|)(?:(?<!\d)|(?<=[,.]\d\d))'
+                    r'(\d+)(,|\.)(\d\d)(\s*\$|\s*€|\s*Dollar|\s*Euro|)')
+        # a name starts with a non space, so (\s*) is not tried shorter,
+        # which would take quadratic time on long lines with many spaces
+        re_name = r'(\s*)(\S(?:.*\S)?)(\s+)'
         re_count = r'(?:(\s+)(\d+)){0,1}(\s*)$'
         self.re_sale = re.compile(r'^'+re_name+re_price+re_count+r'$')
 
         self.re_price = re.compile(re_price)
         self.re_name = re.compile(r'^' + re_name + r'$')
         self.re_count = re.compile(r'^' + re_count + r'$')
-        self.re_some = re.compile(r'^(\s*)(.*\S)(\s*)$')
+        self.re_some = re.compile(r'^(\s*)(\S(?:.*\S)?)(\s*)$')
+
+    def check_line(self, line):
+        """
+        return the matches (name, price, count, name error, price error,
+        count error) of a line, found part by part. The price is the last
+        one of the line, the name is before it and the count after it.
+        """
+        (name, price, count, n_err, p_err, c_err) = (None,) * 6
+        prices = list(self.re_price.finditer(line))
+        if prices:
+            price = prices[-1]
+            a_line = line[:price.start(0)]
+            name = self.re_name.match(a_line)
+            if not name:
+                n_err = self.re_some.match(a_line)
+            c_line = line[price.end(0):]
+            count = self.re_count.match(c_line)
+            if not count:
+                c_err = self.re_some.match(c_line)
+        else:
+            p_err = self.re_some.match(line)
+        return (name, price, count, n_err, p_err, c_err)
+
+    def scan(self, line):
+        """
+        like check_line(), but a valid line is split by one match of
+        re_sale. Only other lines are checked part by part, and lines
+        where check_line() could find a price, that starts in the name:
+        "$" or "€" before the price, or a price before "$" or "€".
+        """
+        match = self.re_sale.match(line)
+        if match:
+            last = line[match.end(2) - 1]
+            if match.end(4) > match.start(4):
+                safe = not last.isdecimal()
+            else:
+                safe = last not in "$€"
+            if safe:
+                end = match.end(8)
+                return (Part(match, 1, (0, match.start(4))),
+                        Part(match, 4, (match.start(4), end)),
+                        Part(match, 9, (end, len(line)), -end),
+                        None, None, None)
+        return self.check_line(line)
 
     def get_cent_price(self, line):
-        """ x """
+        """ price times count of a line in cents, 0 without a count """
         res = 0
         match = self.re_sale.match(line)
         if match:
@@ -81,7 +163,14 @@ class Cshbx():
 
 if __name__ == '__main__':
 
-    App().run(sys.argv)
+    import random
+    import time
+
+    if BACKEND == "gi":
+        from cashbox.app import App
+        App().run(sys.argv)
+    else:
+        appargs.read_appargs({}, [])
     cshbx = Cshbx()
 
     assert cshbx.re_price.match("1,20").groups() == ('', '1', ',', '20', '')
@@ -104,4 +193,75 @@ if __name__ == '__main__':
             ('', '12', '.', '34', '$'))
     assert cshbx.re_price.match("12.3") is None
 
+    # the former patterns, that backtrack on long lines
+    FORMER_PRICE = re.compile(r'(\$\s*|\€\s*|)(\d+)(,|\.)(\d\d)'
+                              r'(\s*\$|\s*€|\s*Dollar|\s*Euro|)')
+    FORMER_NAME = re.compile(r'^(\s*)(.*\S)(\s+)$')
+    FORMER_SOME = re.compile(r'^(\s*)(.*\S)(\s*)$')
+    FORMER_SALE = re.compile(r'^(\s*)(.*\S)(\s+)' + FORMER_PRICE.pattern +
+                             r'(?:(\s+)(\d+)){0,1}(\s*)$')
+
+    def spans(pattern, line):
+        """ spans of all groups of all matches of pattern in line """
+        return [[match.span(g) for g in range(pattern.groups + 1)]
+                for match in pattern.finditer(line)]
+
+    # the patterns find the same as the former ones
+    rnd = random.Random(1)
+    samples = ["Bier 0,25 Liter 1,10€ 2", "  x  12,345,67  3  ",
+               "1,2345,67", "a 1.20Euro5", "€1,2", "a\u2003 1,20\u2003 4"]
+    for _ in range(20000):
+        samples.append("".join(rnd.choice(["1", "2", " ", ",", ".", "$",
+                                           "€", "a", "Euro", "Dollar", "\t",
+                                           "٣"])
+                               for _ in range(rnd.randint(0, 12))))
+    for sample in samples:
+        for (new, former) in [(cshbx.re_price, FORMER_PRICE),
+                              (cshbx.re_name, FORMER_NAME),
+                              (cshbx.re_some, FORMER_SOME)]:
+            assert spans(new, sample) == spans(former, sample), sample
+        sale = FORMER_SALE.match(sample)
+        assert cshbx.get_cent_price(sample) == (
+            sale and sale.group(10) and
+            (int(sale.group(5))*appargs.cents + int(sale.group(7))) *
+            int(sale.group(10)) or 0), sample
+
+    def part_spans(parts):
+        """ spans of all groups of the matches of check_line() """
+        return [part and [part.span(g) for g in range(4 if i != 1 else 6)]
+                for (i, part) in enumerate(parts)]
+
+    # scan() finds the same as check_line()
+    for sample in samples + ["a$ 1,20", "a € 1,20 2", "a 1,00 $2,00",
+                             "a 1,00 $ 2,00 3", "x1,00 €2,00", "a $1,20"]:
+        assert (part_spans(cshbx.scan(sample)) ==
+                part_spans(cshbx.check_line(sample))), sample
+    assert cshbx.scan("a 1,00 $2,00")[0] is None
+    assert isinstance(cshbx.scan("Bier 0,25 Liter 1,10€ 2")[0], Part)
+
+    # lines up to 10000 chars are checked in linear time, also garbage
+    # like OCR output with long runs of spaces, digits and separators
+    BUDGET = 0.05
+    adversarial = [" " * 10000, "1" * 10000, " " * 9996 + "1,20",
+                   " " * 5000 + "1" * 4999 + "x", "$" + " " * 9999,
+                   "1,20" + " " * 9995 + "x", "1,234" * 2000,
+                   "a" + " " * 9990 + "1,20 1", " 1" * 5000, "1," * 5000,
+                   "0 ,1 .2 $ € " * 833]
+    for _ in range(100):
+        adversarial.append("".join(
+            rnd.choice([" ", "1", ",", ".", "$", "€", "a", "Euro", "\t",
+                        "1,20"]) * rnd.choice([1, 10, 100, 1000])
+            for _ in range(100))[:rnd.randint(1, 10000)])
+    for sample in adversarial:
+        seconds = []
+        for _ in range(3):
+            start = time.perf_counter()
+            list(cshbx.re_price.finditer(sample))
+            for new in [cshbx.re_name, cshbx.re_some, cshbx.re_count]:
+                new.match(sample)
+            cshbx.get_cent_price(sample)
+            cshbx.scan(sample)
+            seconds.append(time.perf_counter() - start)
+        assert min(seconds) < BUDGET, (sample[:20], len(sample), min(seconds))
+
     print("all asserts have been ok")
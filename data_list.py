@@ -27,15 +27,239 @@
 
 
 import sys
-import gi
+import os
+import weakref
+from bisect import bisect_left
+from contextlib import contextmanager
+
+dir1 = os.path.dirname(os.path.realpath(__file__))
+dir2 = os.path.dirname(dir1)
+sys.path.append(dir2)
 
 try:
-    gi.require_version(namespace='Adw', version='1')
-    from gi.repository import GObject, Gio
-except (ImportError, ValueError) as exc:
-    print('Error: Dependencies not met.', exc)
+    from cashbox.backend import (ListStore, idle_add, source_remove,
+                                 PRIORITY_HIGH_IDLE, SOURCE_REMOVE)
+except ImportError as exc:
+    print('Error: cashbox modules not found.', exc)
     sys.exit(1)
 
+if __name__ == '__main__':
+    from cashbox.backend import (Object, Property, handler_is_connected,
+                                 main_iteration)
+
+
+def call_weak_method(item, pspec, weak_method):
+    """
+    signal handler, that does not keep the object of the method alive
+    """
+    method = weak_method()
+    if method is not None:
+        method(item, pspec)
+
+
+class OrderIndex():
+    """
+    Position index of the DataItems in one list.
+
+    Every DataItem gets an order key. The keys are kept sorted in the same
+    order as the DataItems in the list, so the position of a DataItem is
+    found by a binary search instead of a linear scan (Gio.ListStore.find).
+    New keys are chosen between the keys of the neighbours. Only if there is
+    no gap left all keys are renumbered.
+
+    >>> index = OrderIndex()
+    >>> for pos, item in enumerate("abc"):
+    ...     index.insert(item, pos)
+    >>> index.insert("x", 1)
+    >>> index.items
+    ['a', 'x', 'b', 'c']
+    >>> index.find("b")
+    (True, 2)
+    >>> index.remove("x")
+    1
+    >>> index.find("x")
+    (False, 0)
+    >>> for i in range(40):
+    ...     index.insert(i, 1)
+    >>> index.items[:3], index.find("b")
+    (['a', 39, 38], (True, 41))
+
+    Items of a plus list, that is sorted like order_list, are inserted by
+    their order key in order_list, found by a binary search:
+
+    >>> order_list = OrderIndex()
+    >>> for pos, item in enumerate([1, 2, 3, 4, 5, 6, 7, 8]):
+    ...     order_list.insert(item, pos)
+    >>> plus = OrderIndex()
+    >>> for item in [2, 4, 6, 8]:
+    ...     _ = plus.insert_key(item, order_list.key[item])
+    >>> plus.insert_key(5, order_list.key[5]), plus.items
+    (2, [2, 4, 5, 6, 8])
+
+    The special item1 of a plus list has no order key. It stays in front of
+    the store, the position in the store is the position in the index plus
+    one:
+
+    >>> store = ["first"] + plus.items
+    >>> pos = plus.insert_key(3, order_list.key[3])
+    >>> store.insert(pos + 1, 3)
+    >>> store, plus.items == store[1:]
+    (['first', 2, 3, 4, 5, 6, 8], True)
+    """
+    STEP = 1 << 16
+
+    def __init__(self):
+        self.keys = []  # sorted order keys
+        self.items = []  # DataItems in the same order as self.keys
+        self.key = {}  # DataItem -> order key
+        self.renumbered = 0  # how often renumber() was needed
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item):
+        return item in self.key
+
+    def find(self, item):
+        """ return (found, position) like Gio.ListStore.find() """
+        key = self.key.get(item)
+        if key is None:
+            return (False, 0)
+        return (True, bisect_left(self.keys, key))
+
+    def insert(self, item, pos):
+        """ insert item at position pos """
+        low = self.keys[pos-1] if pos > 0 else 0
+        high = self.keys[pos] if pos < len(self.keys) else low + 2*self.STEP
+        if high - low < 2:
+            self.renumber()
+            self.insert(item, pos)
+            return
+        key = (low + high) // 2
+        self.keys.insert(pos, key)
+        self.items.insert(pos, item)
+        self.key[item] = key
+
+    def insert_key(self, item, key):
+        """ insert item with a given order key and return its position """
+        pos = bisect_left(self.keys, key)
+        self.keys.insert(pos, key)
+        self.items.insert(pos, item)
+        self.key[item] = key
+        return pos
+
+    def rekey(self, function):
+        """
+        replace all order keys by function(item, old key), without changing
+        the order
+        """
+        self.keys = [function(item, self.key[item]) for item in self.items]
+        self.key = dict(zip(self.items, self.keys))
+
+    def remove(self, item):
+        """ remove item and return its former position """
+        pos = bisect_left(self.keys, self.key.pop(item))
+        del self.keys[pos]
+        del self.items[pos]
+        return pos
+
+    def reset(self, items, keys=None):
+        """ replace all items and keys at once """
+        self.items = items
+        if keys is None:
+            self.renumber()
+        else:
+            self.keys = keys
+            self.key = dict(zip(items, keys))
+
+    def replace(self, pos, removed, items):
+        """
+        replace <removed> items at position pos with items.
+        Few items get keys in the gap, otherwise all keys are renumbered.
+        """
+        if (removed + len(items)) * 8 > len(self.items):
+            self.items[pos:pos+removed] = items
+            self.renumber()
+            return
+        for item in self.items[pos:pos+removed]:
+            del self.key[item]
+        del self.keys[pos:pos+removed]
+        del self.items[pos:pos+removed]
+        for (i, item) in enumerate(items):
+            self.insert(item, pos + i)
+
+    def renumber(self):
+        """ spread keys equally, to have gaps for new keys """
+        self.keys = [(i+1)*self.STEP for i in range(len(self.items))]
+        self.key = dict(zip(self.items, self.keys))
+        self.renumbered += 1
+
+
+class PlusList():
+    """ a plus list of a DataList and what is needed to update it """
+
+    def __init__(self, pick, sort, item1, fields, sort_fields=None):
+        self.store = ListStore()
+        self.pick = pick
+        self.sort = sort
+        self.index = OrderIndex()
+        # properties pick depends on, GObject uses "-" instead of "_"
+        self.fields = None
+        if fields is not None:
+            self.fields = {field.replace("_", "-") for field in fields}
+        # properties the sort key depends on
+        self.sort_fields = None
+        if sort_fields is not None:
+            self.sort_fields = {field.replace("_", "-")
+                                for field in sort_fields}
+        # position of the first DataItem in self.store
+        self.offset = 0
+        if item1:
+            self.store.append(item1)
+            self.offset = 1
+
+    def depends_on(self, field):
+        """ return True if pick has to be checked after field changed """
+        return self.pick is not None and (self.fields is None or
+                                          field in self.fields)
+
+    def resorts(self, field):
+        """ return True if the order key changes, when field changed """
+        return callable(self.sort) and (self.sort_fields is None or
+                                        field in self.sort_fields)
+
+    def order_key(self, item, rank):
+        """
+        order key of item in a sorted plus list.
+        Items with the same sort key keep the order of main_list (rank).
+        """
+        if self.sort is True:
+            return rank[item]
+        return (self.sort(item), rank[item])
+
+    def rerank(self, rank):
+        """ ranks have been renumbered, but kept their order """
+        if self.sort is True:
+            self.index.rekey(lambda item, _old: rank[item])
+        else:
+            # keep the sort key, that may wait for a coalesced update
+            self.index.rekey(lambda item, old: (old[0], rank[item]))
+
+    def signals(self):
+        """ notify signals of a DataItem, this plus list depends on """
+        if self.pick is None:
+            ret = set()
+        elif self.fields is None:
+            ret = {"notify"}
+        else:
+            ret = {f"notify::{field}" for field in self.fields}
+        if callable(self.sort):
+            if self.sort_fields is None:
+                ret = {"notify"}
+            else:
+                ret |= {f"notify::{field}" for field in self.sort_fields}
+        return ret
+
 
 class DataList():
     """
@@ -53,14 +277,50 @@ class DataList():
     Advantages:
       * If one DataItem is changed in any DataList, it is automatically changed
         in all other DataLists.
+
+    Many changes can be made at once with replace_all() or inside of
+    "with data_list.batch():". Then each plus list is calculated only once
+    and changed with one splice.
+
+    With coalesce=True changed DataItems are collected and the plus lists
+    are updated once in the next main loop iteration (or by flush()).
+    If only a few DataItems changed, they are updated one by one, instead
+    of calculating the plus lists again.
     """
+    # the plus lists, batches and coalesced updates need their own state
+    # pylint: disable=too-many-instance-attributes
 
-    def __init__(self):
-        self.main_list = Gio.ListStore()
+    # update DataItems one by one, if at most 1/INCREMENTAL of them changed
+    INCREMENTAL = 8
+
+    def __init__(self, coalesce=False):
+        self.main_list = ListStore()
         self.plus_lists = []
 
-        # needed to find out deleted DataItems
-        self.main_list_last = self.add_plus_list()
+        # > 0 while inside of batch()
+        self.batch_level = 0
+        # all plus lists need an update at the end of batch()
+        self.batch_dirty = False
+
+        self.coalesce = coalesce
+        # changed DataItems (dict used as ordered set) -> changed fields
+        self.dirty = {}
+        # GLib source id of the scheduled flush
+        self.flush_source = None
+
+        # notify signals connected for every DataItem
+        self.signals = set()
+        # DataItem -> ids of its connected signal handlers, the first ones
+        # are connected to self.signals, subclasses may add more
+        self.handlers = {}
+        # DataItems only refer weakly to this DataList
+        self.weak_on_item_changed = weakref.WeakMethod(self.on_item_changed)
+
+        # rank (position in main_list) of all DataItems, used as order key
+        # of sorted plus lists.
+        # self.rank.items is a copy of main_list as python list, needed to
+        # find out deleted DataItems
+        self.rank = OrderIndex()
 
         self.main_list.connect('items-changed', self.on_data_list_changed)
 
@@ -71,153 +331,343 @@ class DataList():
     def __str__(self):
         return self.str(self.main_list)
 
-    def add_plus_list(self, pick=None, sort=False, item1=None, selfname=None):
+    def add_plus_list(self, pick=None, sort=False, item1=None, selfname=None,
+                      *, fields=None, sort_fields=None):
         """
         pick  None: to contain all DataItem
               function: return True if the given DataItem is picked of False
         sort  True: sort added DataItem in the same order as main_list
               False: add new DataItem to the end
+              function: sort by function(DataItem), e.g. by name or price.
+                DataItems with equal keys keep the order of main_list.
         item1   None: No additional first DataItem
               DataItem: The given DataItem should represent a string if printed
+        fields  None: pick depends on all properties of a DataItem
+              set: names of the only properties pick depends on
+        sort_fields  None: a sort function depends on all properties
+              set: names of the only properties a sort function depends on
+
+        A DataItem, whose sort key changed, is moved to its new position
+        with a binary search, the plus list is not sorted again.
         """
-        plus = Gio.ListStore()
-        if item1:
-            plus.append(item1)
-        self.plus_lists.append((plus, pick, sort))
+        # the options of a plus list, only the first ones are positional
+        # pylint: disable=too-many-arguments
+        plus = PlusList(pick, sort, item1, fields, sort_fields)
+        self.plus_lists.append(plus)
         if selfname:
-            setattr(self, selfname, plus)
-        return plus
-
-    def on_item_changed(self, item, _field):
+            setattr(self, selfname, plus.store)
+
+        signals = self.signals | plus.signals()
+        if "notify" in signals:
+            # "notify" is emitted for all properties
+            signals = {"notify"}
+        if signals != self.signals:
+            # only reconnect the own signals, disconnect_item and
+            # connect_item of subclasses would remove and add the items
+            n_signals = len(self.signals)
+            self.signals = signals
+            for item in self.rank.items:
+                handlers = self.handlers[item]
+                for handler in handlers[:n_signals]:
+                    item.disconnect(handler)
+                handlers[:n_signals] = self.connect_signals(item)
+        if self.rank.items:
+            self.update_plus_lists()
+
+        return plus.store
+
+    def on_item_changed(self, item, pspec):
         """ if an item changed, plus lists have to be updated """
-        self.add_item_to_plus_list_where_needed(item)
-
-    def add_item_to_plus_list_where_needed(self, item):
-        """ check to which plus list an item belongs and update them """
-        for plus_list, pick, sort in self.plus_lists:
-            found, pos = plus_list.find(item)
-            if pick:
-                if pick(item):
-                    if not found:
-                        if sort:
-                            self.add_item_sorted(item, plus_list)
-                        else:
-                            plus_list.append(item)
-                elif found:
-                    plus_list.remove(pos)
-            elif not found:
-                if sort:
-                    self.add_item_sorted(item, plus_list)
-                else:
-                    plus_list.append(item)
+        if item not in self.rank:
+            # item has already been removed from main_list
+            pass
+        elif self.batch_level or self.coalesce:
+            self.dirty.setdefault(item, set()).add(pspec.name)
+            if not self.batch_level and self.flush_source is None:
+                self.flush_source = idle_add(self.on_flush,
+                                             priority=PRIORITY_HIGH_IDLE)
+        else:
+            self.add_item_to_plus_list_where_needed(item, pspec.name)
+
+    def on_flush(self):
+        """ idle callback to flush collected changes """
+        self.flush_source = None
+        self.flush()
+        return SOURCE_REMOVE
+
+    def flush(self):
+        """ update plus lists for all collected changes """
+        if self.flush_source is not None:
+            source_remove(self.flush_source)
+            self.flush_source = None
+        dirty, self.dirty = self.dirty, {}
+        if self.batch_dirty:
+            self.batch_dirty = False
+            self.update_plus_lists()
+        elif len(dirty) == 1 or \
+                len(dirty) * self.INCREMENTAL <= len(self.rank):
+            for (item, fields) in dirty.items():
+                if item in self.rank:
+                    for field in fields:
+                        self.add_item_to_plus_list_where_needed(item, field)
+        elif dirty:
+            self.update_plus_lists(dirty)
+
+    def add_item_to_plus_list_where_needed(self, item, field=None):
+        """
+        check to which plus list an item belongs and update them.
+        If field is given, only plus lists depending on field are checked.
+        """
+        for plus in self.plus_lists:
+            found = item in plus.index
+            if field is not None and not plus.depends_on(field):
+                if found and plus.resorts(field):
+                    self.move_item_in_plus_list(item, plus)
+            elif plus.pick is None or plus.pick(item):
+                if not found:
+                    self.add_item_to_plus_list(item, plus)
+                elif field is not None and plus.resorts(field):
+                    self.move_item_in_plus_list(item, plus)
+            elif found:
+                self.del_item_from_plus_list(item, plus)
 
     def del_item_from_plus_list_where_needed(self, item):
         """ check if an item is no longer needed in a plus list """
-        for plus_list, _, _ in self.plus_lists:
-            found, pos = plus_list.find(item)
-            if found:
-                plus_list.remove(pos)
-
-    def add_item_sorted(self, item, plus_list, order_list=None):
-        """
-        >>> order_list = [1,2,3,4,5,6,7,8]
-        >>> plus_list = [2,4,6,8]
-        >>> DataList.add_item_sorted(None, 5, plus_list, order_list)
-        >>> DataList.str(None, plus_list)
-        '[2,4,5,6,8]'
-
-        >>> plus_list = ["first",2,4,6,8]
-        >>> DataList.add_item_sorted(None, 5, plus_list, order_list)
-        >>> DataList.str(None, plus_list)
-        '[first,2,4,5,6,8]'
-
-        """
-        if order_list is None:
-            order_list = self.main_list
-
-        is_break = False
-        plus_i = 0
-        order_i = 0
-
-        if len(plus_list) >= 1 and not plus_list[0] in order_list:
-            # special item1 used
-            plus_i = 1
-
-        while plus_i < len(plus_list):
-            plus_item = plus_list[plus_i]
-            while order_i < len(order_list):
-                order_item = order_list[order_i]
-                if order_item == item:
-                    is_break = True
-                    break
-                if order_item == plus_item:
-                    break
-                order_i += 1
-            if is_break:
-                break
-            plus_i += 1
-        plus_list.insert(plus_i, item)
+        for plus in self.plus_lists:
+            if item in plus.index:
+                self.del_item_from_plus_list(item, plus)
+
+    def add_item_to_plus_list(self, item, plus):
+        """ add item to plus list and its index """
+        if plus.sort:
+            # the order key of a sorted plus list contains the rank in
+            # main_list
+            pos = plus.index.insert_key(item,
+                                        plus.order_key(item, self.rank.key))
+            plus.store.insert(pos + plus.offset, item)
+        else:
+            plus.index.insert(item, len(plus.index))
+            plus.store.append(item)
+
+    def del_item_from_plus_list(self, item, plus):
+        """ remove item from plus list and its index """
+        plus.store.remove(plus.index.remove(item) + plus.offset)
+
+    def move_item_in_plus_list(self, item, plus):
+        """ move item to the position of its changed sort key """
+        old = plus.index.remove(item)
+        new = plus.index.insert_key(item, plus.order_key(item, self.rank.key))
+        if new != old:
+            plus.store.remove(old + plus.offset)
+            plus.store.insert(new + plus.offset, item)
 
     def on_data_list_changed(self, _list_store, position, removed, added):
         """ called when items have changed """
-        assert added == 1 or removed == 1
-        if added == 1:
-            item = self.main_list[position]
-            item.connect('notify', self.on_item_changed)
-            self.add_item_to_plus_list_where_needed(item)
-        elif removed == 1:
-            item = self.main_list_last[position]
-            self.del_item_from_plus_list_where_needed(item)
+        old = self.rank.items[position:position+removed]
+        new = [self.main_list[i] for i in range(position, position+added)]
+        renumbered = self.rank.renumbered
+
+        if removed + added == 1:
+            if added:
+                self.insert_rank(new[0], position)
+            else:
+                self.rank.remove(old[0])
+        else:
+            self.rank.replace(position, removed, new)
+
+        for item in old:
+            self.disconnect_item(item)
+        for item in new:
+            self.connect_item(item)
+
+        if self.batch_level:
+            self.batch_dirty = True
+        else:
+            self.change_plus_lists(old, new, renumbered)
+
+    def change_plus_lists(self, old, new, renumbered):
+        """
+        remove the old and add the new DataItems of main_list to the plus
+        lists one by one, or calculate the plus lists again, if many
+        changed. renumbered is rank.renumbered before the change.
+        """
+        if len(old) + len(new) == 1:
+            if new:
+                self.add_item_to_plus_list_where_needed(new[0])
+            else:
+                self.del_item_from_plus_list_where_needed(old[0])
+        elif (len(old) + len(new)) * self.INCREMENTAL <= len(self.rank):
+            # only the removed and added items are checked
+            for item in old:
+                self.del_item_from_plus_list_where_needed(item)
+            if self.rank.renumbered != renumbered:
+                for plus in self.plus_lists:
+                    if plus.sort:
+                        plus.rerank(self.rank.key)
+            for item in new:
+                self.add_item_to_plus_list_where_needed(item)
+        else:
+            self.update_plus_lists()
+
+    def connect_item(self, item):
+        """ connect the needed notify signals of item """
+        self.handlers[item] = self.connect_signals(item)
+
+    def connect_signals(self, item):
+        """ return the ids of handlers connected to self.signals of item """
+        return [
+            item.connect(signal, call_weak_method, self.weak_on_item_changed)
+            for signal in self.signals]
+
+    def disconnect_item(self, item):
+        """ disconnect all signals connected by connect_item """
+        for handler in self.handlers.pop(item, []):
+            item.disconnect(handler)
+
+    def insert_rank(self, item, position):
+        """ give item a rank in main_list """
+        renumbered = self.rank.renumbered
+        self.rank.insert(item, position)
+        if self.rank.renumbered != renumbered and not self.batch_level:
+            # ranks changed, but not their order
+            for plus in self.plus_lists:
+                if plus.sort:
+                    plus.rerank(self.rank.key)
+
+    def update_plus_lists(self, dirty=None):
+        """
+        calculate plus lists again and change each of them with one
+        splice, if needed.
+        dirty  None: check all DataItems
+               dict: only check these DataItems for the changed fields
+        """
+        for plus in self.plus_lists:
+            def picked(item, pick=plus.pick):
+                return pick is None or pick(item)
+
+            def order_key(item, plus=plus):
+                return plus.order_key(item, self.rank.key)
+
+            if dirty is not None:
+                changed = [item for item, fields in dirty.items()
+                           if item in self.rank and
+                           any(plus.depends_on(field) for field in fields)]
+                drop = {item for item in changed
+                        if item in plus.index and not picked(item)}
+                add = [item for item in changed
+                       if item not in plus.index and picked(item)]
+                resorted = any(item in plus.index and
+                               any(plus.resorts(field) for field in fields)
+                               for item, fields in dirty.items())
+                if not drop and not add and not resorted:
+                    continue
+                items = [item for item in plus.index.items
+                         if item not in drop] + add
+                if plus.sort:
+                    items.sort(key=order_key)
+            elif plus.sort is True:
+                items = [item for item in self.rank.items if picked(item)]
+            elif plus.sort:
+                items = sorted((item for item in self.rank.items
+                                if picked(item)), key=order_key)
+            else:
+                # keep the order of remaining items and append new items
+                items = [item for item in plus.index.items
+                         if item in self.rank and picked(item)]
+                seen = set(items)
+                items += [item for item in self.rank.items
+                          if item not in seen and picked(item)]
+
+            keys = None
+            if plus.sort:
+                keys = [order_key(item) for item in items]
+            if items != plus.index.items:
+                n_items = len(plus.index)
+                plus.index.reset(items, keys)
+                plus.store.splice(plus.offset, n_items, items)
+            elif keys is not None:
+                plus.index.reset(items, keys)
+
+    @contextmanager
+    def batch(self):
+        """
+        delay updates of plus lists until the end of many changes:
+
+        with data_list.batch():
+            for item in items:
+                data_list.main_list.append(item)
+        """
+        self.batch_level += 1
+        try:
+            yield self
+        finally:
+            self.batch_level -= 1
+            if not self.batch_level:
+                self.flush()
+
+    def replace_all(self, items):
+        """ replace all items of main_list with one splice """
+        self.main_list.splice(0, len(self.main_list), items)
 
     def clear(self):
         """ delete items """
-        for _ in range(0, len(self.main_list)):
-            # currently only deleting one item at once is allowed by
-            #  on_data_list_changed
-            self.main_list.remove(0)
+        self.replace_all([])
 
 
 if __name__ == '__main__':
 
+    import gc
     import doctest
     doctest.testmod()
 
-    class Data(GObject.Object):
+    class Data(Object):
         """ Test Data """
-        name = GObject.Property(type=str)
-        count = GObject.Property(type=int)
+        name = Property(type=str)
+        count = Property(type=int)
 
         def __init__(self, name, count=0):
             super().__init__()
             self.name = name
             self.count = count
 
-            self.picklists = []
-            self.unpicklists = []
-
         def __str__(self):
             if self.count >= 0:
                 return f"({self.name},{self.count})"
             # used for DataList.plus_lists to display item1 in a drop down box
             return f"{self.name}"
 
+    pick_calls = []
+
     def is_picked(item):
         """ test selection rule for plus list """
+        pick_calls.append(item)
         return item.count > 0
 
     def is_unpicked(item):
         """ test selection rule for plus list """
-        return not is_picked(item)
+        return item.count <= 0
+
+    def check_index(data_list):
+        """ every plus list index must match the plus list """
+        for plus in data_list.plus_lists:
+            assert plus.index.items == list(plus.store)[plus.offset:]
+            for pos, item in enumerate(plus.index.items):
+                assert plus.index.find(item) == (True, pos)
+                if plus.sort:
+                    assert plus.index.key[item] == \
+                        plus.order_key(item, data_list.rank.key)
 
     data = DataList()
     main_list = data.main_list
-    data.add_plus_list(pick=is_picked, selfname="picked1")
+    picked1 = data.add_plus_list(pick=is_picked, selfname="picked1",
+                                 fields={"count"})
     unpicked1 = data.add_plus_list(pick=is_unpicked)
     unpicked2 = data.add_plus_list(pick=is_unpicked, sort=True,
+                                   fields={"count"},
                                    item1=Data("select item", -1))
     assert f"{data}" == "[]"
     assert f"{data.str(data.main_list)}" == "[]"
-    assert f"{data.str(data.main_list_last)}" == "[]"
+    assert f"{data.str(data.rank.items)}" == "[]"
     assert f"{data.str(data.picked1)}" == "[]"
 
     assert f"{data.str(unpicked1)}" == "[]"
@@ -228,28 +678,227 @@ if __name__ == '__main__':
     assert f"{data}" == "[(one,1),(two,2),(three,3),(four,0)]"
     assert f"{data.str(data.main_list)}" == ("[(one,1),(two,2),(three,3),"
                                              "(four,0)]")
-    assert f"{data.str(data.main_list_last)}" == ("[(one,1),(two,2),"
-                                                  "(three,3),(four,0)]")
+    assert f"{data.str(data.rank.items)}" == ("[(one,1),(two,2),"
+                                              "(three,3),(four,0)]")
     assert f"{data.str(data.picked1)}" == "[(one,1),(two,2),(three,3)]"
     assert f"{data.str(unpicked1)}" == "[(four,0)]"
     assert f"{data.str(unpicked2)}" == "[select item,(four,0)]"
+    check_index(data)
+
+    # a name does not change picked1
+    pick_calls.clear()
+    main_list[0].name = "One"
+    main_list[0].name = "one"
+    assert not pick_calls
 
     main_list[0].count = 0
+    assert pick_calls == [main_list[0]]
     assert f"{data}" == "[(one,0),(two,2),(three,3),(four,0)]"
     assert f"{data.str(data.main_list)}" == ("[(one,0),(two,2),(three,3),"
                                              "(four,0)]")
-    assert f"{data.str(data.main_list_last)}" == ("[(one,0),(two,2),"
-                                                  "(three,3),(four,0)]")
+    assert f"{data.str(data.rank.items)}" == ("[(one,0),(two,2),"
+                                              "(three,3),(four,0)]")
     assert f"{data.str(data.picked1)}" == "[(two,2),(three,3)]"
     assert f"{data.str(unpicked1)}" == "[(four,0),(one,0)]"
     assert f"{data.str(unpicked2)}" == "[select item,(one,0),(four,0)]"
+    check_index(data)
 
     main_list.remove(2)
     assert f"{data}" == "[(one,0),(two,2),(four,0)]"
     assert f"{data.str(data.main_list)}" == "[(one,0),(two,2),(four,0)]"
-    assert f"{data.str(data.main_list_last)}" == "[(one,0),(two,2),(four,0)]"
+    assert f"{data.str(data.rank.items)}" == "[(one,0),(two,2),(four,0)]"
     assert f"{data.str(data.picked1)}" == "[(two,2)]"
     assert f"{data.str(unpicked1)}" == "[(four,0),(one,0)]"
     assert f"{data.str(unpicked2)}" == "[select item,(one,0),(four,0)]"
+    check_index(data)
+
+    main_list.insert(1, Data("five", 0))
+    main_list.insert(0, Data("six", 0))
+    assert f"{data}" == "[(six,0),(one,0),(five,0),(two,2),(four,0)]"
+    assert f"{data.str(data.rank.items)}" == f"{data}"
+    assert f"{data.str(unpicked1)}" == "[(four,0),(one,0),(five,0),(six,0)]"
+    assert f"{data.str(unpicked2)}" == ("[select item,(six,0),(one,0),"
+                                        "(five,0),(four,0)]")
+    check_index(data)
+
+    # more inserts at the same position than gaps between two ranks
+    for nr in range(40):
+        main_list.insert(1, Data(f"n{nr}", 1))
+    main_list[0].count = 1
+    main_list[0].count = 0
+    assert data.rank.renumbered > 0
+    assert f"{data.str(data.rank.items)}" == f"{data}"
+    assert f"{data.str(unpicked2)}" == ("[select item,(six,0),(one,0),"
+                                        "(five,0),(four,0)]")
+    check_index(data)
+
+    # replace_all and batch change every plus list with one splice
+    emitted = []
+    for plus_list in data.plus_lists:
+        plus_list.store.connect('items-changed',
+                           lambda store, *args: emitted.append(store))
+    old_items = list(main_list)
+    data.replace_all([Data(f"b{i}", i % 2) for i in range(100)])
+    assert len(main_list) == 100
+    assert len(picked1) == 50 and len(unpicked1) == 50
+    assert len(emitted) == len(data.plus_lists)
+    check_index(data)
+
+    # removed items do not change plus lists any more
+    old_items[0].count = 7
+    assert f"{data.str(picked1)}".find("(six,7)") == -1
+
+    emitted.clear()
+    with data.batch():
+        for data_item in list(main_list)[:10]:
+            data_item.count = 1 - data_item.count
+        main_list.append(Data("c1", 0))
+        main_list.remove(0)
+    assert len(emitted) == len(data.plus_lists)
+    assert len(main_list) == 100
+    assert len(picked1) == 49 and len(unpicked1) == 51
+    assert f"{data.str(data.rank.items)}" == f"{data}"
+    assert data.str(unpicked2)[:28] == "[select item,(b1,0),(b3,0),("
+    assert data.str(unpicked2).endswith(",(c1,0)]")
+    check_index(data)
+
+    emitted.clear()
+    data.clear()
+    assert f"{data}" == "[]"
+    assert f"{data.str(unpicked2)}" == "[select item]"
+    # picked1 and unpicked1 and unpicked2
+    assert len(emitted) == len(data.plus_lists)
+    check_index(data)
+
+    # coalesce: many changes result in one splice of each plus list
+    coalesced = DataList(coalesce=True)
+    coalesced_picked = coalesced.add_plus_list(pick=is_picked,
+                                               fields={"count"})
+    coalesced_unpicked = coalesced.add_plus_list(
+        pick=is_unpicked, sort=True, fields={"count"},
+        item1=Data("select item", -1))
+    coalesced.replace_all([Data(f"d{i}", 0) for i in range(20)])
+    emitted.clear()
+    for plus_list in coalesced.plus_lists:
+        plus_list.store.connect('items-changed',
+                           lambda store, *args: emitted.append(store))
+    for data_item in list(coalesced.main_list)[::2]:
+        data_item.count = 1
+    assert len(coalesced_picked) == 0 and not emitted
+    main_iteration()
+    assert len(coalesced_picked) == 10 and len(coalesced_unpicked) == 11
+    assert (coalesced.str(coalesced_unpicked)[:26] ==
+            "[select item,(d1,0),(d3,0)")
+    assert sorted(emitted, key=id) == sorted([coalesced_picked,
+                                              coalesced_unpicked], key=id)
+    check_index(coalesced)
+
+    # one change is still done without splicing the whole plus list
+    coalesced.main_list[1].count = 2
+    coalesced.flush()
+    assert coalesced.str(coalesced_picked).endswith(",(d1,2)]")
+    assert coalesced.flush_source is None
+    check_index(coalesced)
+
+    # a few changes are done one by one, without rebuilding plus lists
+    emitted.clear()
+    coalesced.main_list[3].count = 1
+    coalesced.main_list[5].count = 1
+    coalesced.flush()
+    assert len(emitted) == 4  # picked and unpicked of each DataItem
+    assert coalesced.str(coalesced_picked).endswith(",(d1,2),(d3,1),(d5,1)]")
+    check_index(coalesced)
+
+    # plus lists ordered by a key are kept in order by moving single items
+    ordered = DataList()
+    by_name = ordered.add_plus_list(pick=is_unpicked, sort=lambda d: d.name,
+                                    fields={"count"}, sort_fields={"name"},
+                                    item1=Data("select item", -1))
+    by_count = ordered.add_plus_list(sort=lambda d: -d.count,
+                                     sort_fields={"count"})
+    assert ordered.signals == {"notify::count", "notify::name"}
+    for fruit in ["pear", "apple", "fig", "kiwi", "date"]:
+        ordered.main_list.append(Data(fruit))
+    assert ordered.str(by_name) == ("[select item,(apple,0),(date,0),"
+                                    "(fig,0),(kiwi,0),(pear,0)]")
+    emitted.clear()
+    by_name.connect('items-changed', lambda store, *args: emitted.append(args))
+    ordered.main_list[1].name = "zucchini"
+    assert emitted == [(1, 1, 0), (5, 0, 1)]
+    assert ordered.str(by_name).endswith(",(pear,0),(zucchini,0)]")
+    ordered.main_list[2].count = 3
+    ordered.main_list[0].count = 1
+    # equal keys keep the order of main_list
+    assert ordered.str(by_count) == ("[(fig,3),(pear,1),(zucchini,0),"
+                                     "(kiwi,0),(date,0)]")
+    assert ordered.str(by_name) == ("[select item,(date,0),(kiwi,0),"
+                                    "(zucchini,0)]")
+    check_index(ordered)
+
+    # the same with coalesced and renumbered ranks
+    ordered.coalesce = True
+    ordered.main_list[4].count = 5
+    for nr in range(40):
+        ordered.main_list.insert(1, Data(f"a{nr:02}", nr % 4))
+    ordered.main_list[0].name = "banana"
+    ordered.flush()
+    assert list(by_count) == sorted(ordered.rank.items,
+                                    key=lambda d: (-d.count,
+                                                   ordered.rank.key[d]))
+    assert list(by_name)[1:] == sorted(
+        (d for d in ordered.rank.items if d.count == 0),
+        key=lambda d: d.name)
+    check_index(ordered)
+
+    # small splices only check the removed and added items
+    ordered.coalesce = False
+    calls = []
+    ordered.update_plus_lists = lambda dirty=None: calls.append(dirty)
+    for nr in range(60):
+        ordered.main_list.splice(1 + nr % 7, 2, [Data(f"s{nr:02}", nr % 3),
+                                                 Data(f"r{nr:02}", 0)])
+    assert not calls
+    del ordered.update_plus_lists
+    assert list(by_count) == sorted(ordered.rank.items,
+                                    key=lambda d: (-d.count,
+                                                   ordered.rank.key[d]))
+    assert list(by_name)[1:] == sorted(
+        (d for d in ordered.rank.items if d.count == 0),
+        key=lambda d: d.name)
+    check_index(ordered)
+
+    # signal handlers of removed items are disconnected
+    def n_handlers(data_list):
+        """ number of connected signal handlers of all DataItems """
+        return sum(len(handlers) for handlers in data_list.handlers.values())
+
+    del data_item
+    for _ in range(5):
+        old_items = list(data.main_list)
+        data.replace_all([Data(f"e{i}", i % 3) for i in range(50)])
+        assert n_handlers(data) == 50 * len(data.signals)
+        assert set(data.handlers) == set(data.main_list)
+        weak_old = [weakref.ref(item) for item in old_items]
+        del old_items
+        pick_calls.clear()
+        gc.collect()
+        assert not [ref for ref in weak_old if ref() is not None]
+    old_item = data.main_list[0]
+    old_handlers = data.handlers[old_item]
+    assert old_handlers
+    data.clear()
+    assert not [handler for handler in old_handlers
+                if handler_is_connected(old_item, handler)]
+    assert not data.handlers
+    data.replace_all([Data(f"e{i}", i % 3) for i in range(50)])
+    check_index(data)
+
+    # DataItems do not keep their DataList alive
+    kept_items = list(data.main_list)
+    weak_data = weakref.ref(data)
+    del data, main_list
+    gc.collect()
+    assert weak_data() is None
+    kept_items[0].count = 5
 
     print("all asserts have been ok")
@@ -62,12 +62,25 @@ class DropDownWidget(Gtk.Box):
     """ Widget which displays Rows """
     __gtype_name__ = 'DropDownWidget'
     drop_down = Gtk.Template.Child()
+    order_drop_down = Gtk.Template.Child()
 
-    def __init__(self, data_list, **kwargs):
+    def __init__(self, data_list, sale=None, **kwargs):
         super().__init__(**kwargs)
 
         # Set model
-        self.drop_down.set_model(data_list)
+        self.binding = None
+        self.set_model(data_list)
+
+        # with a sale, the order of drop_unpicked can be selected
+        self.sale = sale
+        self.orders = []
+        if sale is not None:
+            self.orders = list(sale.DROP_ORDERS)
+            labels = [sale.DROP_ORDERS[order][0] for order in self.orders]
+            self.order_drop_down.set_model(Gtk.StringList.new(labels))
+            self.order_drop_down.connect("notify::selected",
+                                         self.on_order_selected)
+            self.order_drop_down.set_visible(True)
 
         # Set up the factory
         factory = Gtk.SignalListItemFactory()
@@ -75,12 +88,22 @@ class DropDownWidget(Gtk.Box):
         factory.connect("bind", self._on_factory_bind)
         self.drop_down.set_factory(factory)
 
-        data_list.bind_property(
+    def set_model(self, data_list):
+        """ show data_list in drop_down """
+        if self.binding:
+            self.binding.unbind()
+        self.drop_down.set_model(data_list)
+        self.binding = data_list.bind_property(
             "n-items",
             self.drop_down, "sensitive",
             GObject.BindingFlags.SYNC_CREATE,
             self._calc_sensitive, None)
 
+    def on_order_selected(self, order_drop_down, _pspec):
+        """ show drop_unpicked in the selected order """
+        order = self.orders[order_drop_down.get_selected()]
+        self.set_model(self.sale.drop_unpicked_by(order))
+
     def get_drop_down(self):
         """ return drop_down """
         return self.drop_down
@@ -126,7 +149,7 @@ if __name__ == '__main__':
             for f in article:
                 sale.main_list.append(Article(f[0], f[1], f[2]))
 
-            drop_down_widget = DropDownWidget(sale.drop_unpicked)
+            drop_down_widget = DropDownWidget(sale.drop_unpicked, sale=sale)
             drop_down = drop_down_widget.get_drop_down()
             drop_down.connect("notify::selected-item",
                               self.do_delete_selected_item)
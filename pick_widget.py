@@ -37,6 +37,7 @@ sys.path.append(dir1)
 try:
     from cashbox.utils import reduce_window_size
     from cashbox.article import Article
+    from cashbox.locale_utils import _
 except ImportError as exc:
     print('Error: cashbox modules not found.', exc)
     sys.exit(1)
@@ -67,6 +68,7 @@ class PickWidget(Gtk.Box):
     """ PickWidget to select articles to buy """
     __gtype_name__ = 'PickWidget'
     list_view = Gtk.Template.Child()
+    order_drop_down = Gtk.Template.Child()
 
     def __init__(self, sale, **kwargs):
         super().__init__(**kwargs)
@@ -85,6 +87,40 @@ class PickWidget(Gtk.Box):
         factory.connect("setup", self.factory_setup)
         factory.connect("bind", self.factory_bind)
 
+        # open orders, picked follows the current order without a new model
+        self.order_labels = Gtk.StringList()
+        self.updating_orders = False
+        self.order_drop_down.set_model(self.order_labels)
+        self.sale.orders.connect("notify::size", self.on_orders_changed)
+        self.sale.orders.connect("notify::current", self.on_orders_changed)
+        self.on_orders_changed(self.sale.orders, None)
+
+    def on_orders_changed(self, orders, _pspec):
+        """ show the open orders and select the current one """
+        self.updating_orders = True
+        n_labels = self.order_labels.get_n_items()
+        if orders.size > n_labels:
+            self.order_labels.splice(
+                n_labels, 0, [_("order") + f" {n + 1}"
+                              for n in range(n_labels, orders.size)])
+        elif orders.size < n_labels:
+            self.order_labels.splice(orders.size, n_labels - orders.size,
+                                     [])
+        self.order_drop_down.set_selected(orders.current)
+        self.order_drop_down.set_visible(orders.size > 1)
+        self.updating_orders = False
+
+    @Gtk.Template.Callback()
+    def on_order_selected(self, order_drop_down, _pspec):
+        """ show the selected order """
+        if not self.updating_orders:
+            self.sale.switch_order(order_drop_down.get_selected())
+
+    @Gtk.Template.Callback()
+    def on_new_order(self, _button):
+        """ open another order, the former one stays open """
+        self.sale.new_order()
+
     def factory_setup(self, _fact, item):
         """ setup factory """
         pick_row = PickRow()
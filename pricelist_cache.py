@@ -0,0 +1,161 @@
+#!/usr/bin/python3
+
+# pricelist_cache.py
+#
+# Copyright:
+#   Copyright (C) 2024-2025 Bernd Schumacher <bernd@bschu.de>
+#
+# License: GPL-3.0+
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#   .
+#   This package is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#   .
+#   You should have received a copy of the GNU General Public License
+#   along with this program. If not, see <https://www.gnu.org/licenses/>.
+# Comment:
+#   On Debian systems, the complete text of the GNU General
+#   Public License version 3 can be found in
+#   "/usr/share/common-licenses/GPL-3".
+
+"""
+pricelist_cache.py keeps checked price lists in appargs.user_app_dir, so
+an unchanged FILE can be shown at startup without checking it again.
+
+A cache entry is valid for the same path, mtime, content hash and the
+settings used to check it. It holds the articles and comments in columns,
+the colored parts of the text and the names found in the lines, stored
+with marshal.
+"""
+
+import sys
+import os
+import marshal
+import hashlib
+from array import array
+
+dir1 = os.path.dirname(os.path.realpath(__file__))
+dir2 = os.path.dirname(dir1)
+sys.path.append(dir2)
+
+try:
+    from cashbox.read_appargs import appargs
+    from cashbox.backend import BACKEND
+except ImportError as exc:
+    print('Error: cashbox modules not found.', exc)
+    sys.exit(1)
+
+# change, if the format or the checks of the price list change
+CACHE_VERSION = 2
+
+
+def cache_path(path):
+    """ path of the cache entry of a price list """
+    name = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()
+    return os.path.join(appargs.user_app_dir, "cache", f"{name}.pricelist")
+
+
+def cache_key(path, data):
+    """ everything the cached result depends on """
+    return (CACHE_VERSION, os.path.abspath(path), os.stat(path).st_mtime_ns,
+            hashlib.sha256(data).hexdigest(), appargs.digits,
+            appargs.max_name_len)
+
+
+def save(path, data, values, tags, lines):
+    """
+    save the checked price list
+    path: the price list FILE
+    data: content of the FILE as bytes
+    values: item_value() of the Articles and Comments of the FILE
+    tags: (tag number, start, end) of each colored part
+    lines: (name or None, candidate, double) of each line
+    """
+    entry = (cache_key(path, data),
+             bytes(value[0] for value in values),
+             [value[1] for value in values],
+             array("q", [value[2] for value in values]).tobytes(),
+             array("q", [value[3] for value in values]).tobytes(),
+             array("q", [n for tag in tags for n in tag]).tobytes(),
+             [name for (name, _candidate, _double) in lines],
+             bytes(candidate + 2 * double
+                   for (_name, candidate, double) in lines))
+    cache = cache_path(path)
+    os.makedirs(os.path.dirname(cache), exist_ok=True)
+    with open(cache + ".tmp", "wb") as file:
+        marshal.dump(entry, file)
+    os.replace(cache + ".tmp", cache)
+
+
+def load(path, data):
+    """
+    return (values, tags, lines) saved for the price list or None if the
+    price list or the settings have changed
+    """
+    try:
+        with open(cache_path(path), "rb") as file:
+            entry = marshal.load(file)
+        (key, articles, names, prices, counts, tags, line_names,
+         flags) = entry
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if key != cache_key(path, data):
+        return None
+    prices = array("q", prices)
+    counts = array("q", counts)
+    tags = array("q", tags)
+    values = list(zip(map(bool, articles), names, prices, counts))
+    lines = [(name, bool(flag & 1), bool(flag & 2))
+             for (name, flag) in zip(line_names, flags)]
+    return (values, list(zip(tags[0::3], tags[1::3], tags[2::3])), lines)
+
+
+if __name__ == '__main__':
+
+    import time
+    import tempfile
+
+    if BACKEND == "gi":
+        from cashbox.app import App
+        App().run(sys.argv)
+    else:
+        appargs.read_appargs({}, [])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        appargs.user_app_dir = tmp
+        pricelist = os.path.join(tmp, "fruits.cshbx")
+        with open(pricelist, "w", encoding="utf-8") as p:
+            p.write("# fruits\nBanana 1.10 2\nApple 2.00\n")
+        with open(pricelist, "rb") as p:
+            content = p.read()
+
+        assert load(pricelist, content) is None
+        save(pricelist, content,
+             [(False, "# fruits", 0, 0), (True, "Banana", 110, 2),
+              (True, "Apple", 200, 0)], [(0, 9, 15), (1, 16, 20)],
+             [(None, False, False), ("Banana", True, False),
+              ("Apple", True, False), (None, False, False)])
+        (cached, cached_tags, cached_lines) = load(pricelist, content)
+        assert cached == [(False, "# fruits", 0, 0), (True, "Banana", 110, 2),
+                          (True, "Apple", 200, 0)]
+        assert cached_tags == [(0, 9, 15), (1, 16, 20)]
+        assert cached_lines == [(None, False, False), ("Banana", True, False),
+                                ("Apple", True, False), (None, False, False)]
+
+        # a changed file is checked again
+        assert load(pricelist, content + b"Pear 3.00\n") is None
+        time.sleep(0.01)
+        os.utime(pricelist)
+        assert load(pricelist, content) is None
+
+        # a broken cache is ignored
+        with open(cache_path(pricelist), "wb") as p:
+            p.write(b"broken")
+        assert load(pricelist, content) is None
+
+    print("all asserts have been ok")
@@ -27,6 +27,7 @@
 
 import sys
 import os
+import re
 import doctest
 import gi
 
@@ -35,10 +36,12 @@ dir2 = os.path.dirname(dir1)
 sys.path.append(dir2)
 
 try:
-    from cashbox.utils import create_action
-    from cashbox.article import Article, Comment, Sale, str2cent
+    from cashbox.utils import create_action, BufferWriter, Debounce
+    from cashbox.article import (Article, Sale, str2cent, reconcile,
+                                  item_values)
     from cashbox.read_appargs import appargs
     from cashbox.cshbx import Cshbx
+    from cashbox import pricelist_cache
     from cashbox.dialog_widget import DialogWidget
     from cashbox.locale_utils import _, f
 except ImportError as exc:
@@ -55,10 +58,16 @@ except (ImportError, ValueError) as exc:
     print('Error: Dependencies not met.', exc)
     sys.exit(1)
 
+# a line of the text and its line break, like lines of a Gtk.TextBuffer
+LINE = re.compile("([^\r\n\u2029]*)(\r\n|[\r\n\u2029]|)")
+LINE_BREAK = re.compile("\r\n|[\r\n\u2029]")
+
 
 @Gtk.Template(filename=f'{dir1}/pricelist_widget.ui')
 class PricelistWidget(Gtk.Box):
     """ to edit a list of articles """
+    # the checked lines are kept, to check only the changed ones
+    # pylint: disable=too-many-instance-attributes,too-many-public-methods
     __gtype_name__ = 'PricelistWidget'
     textview = Gtk.Template.Child()
     error = Gtk.Template.Child()
@@ -93,15 +102,84 @@ class PricelistWidget(Gtk.Box):
             if self.other_err["name_to_long"] <= 0:
                 self.other_err["name_to_long"] = None
 
+    class LineState():
+        "Result of the last check of one line"
+        # plain slots, set by parse_line() and check_changes()
+        # pylint: disable=too-many-instance-attributes,too-few-public-methods
+        __slots__ = ("text", "li", "name", "candidate", "double", "error",
+                     "pos", "edit")
+
+        def __init__(self, text):
+            self.text = text
+            self.li = None  # LineInfo, None for comments
+            self.name = None  # article name, if one was found
+            self.candidate = False  # ok, if the name is not double
+            self.double = False  # the name is used by a line before
+            self.error = []  # hints, None until a cached line is parsed
+            self.pos = None  # line number, before edit_log[edit:]
+            self.edit = 0
+
+    class LineWriter(BufferWriter):
+        "BufferWriter, that checks each line, when it is complete"
+
+        def __init__(self, widget):
+            super().__init__(widget.buffer)
+            self.widget = widget
+            self.line = ""  # the last line, that may get more text
+            self.start = 0  # its offset
+            self.seen = set()  # names of lines before, that may be ok
+            self.values = []  # item_value() of each line
+
+        def write(self, text):
+            """ append text to the buffer and check its complete lines """
+            super().write(text)
+            offset = self.start
+            for match in LINE.finditer(self.line + text):
+                if not match.group(2):
+                    (self.line, self.start) = (match.group(1),
+                                               offset + match.start())
+                    break
+                self.widget.check_text_line(match.group(1),
+                                            offset + match.start(),
+                                            self.seen, self.values)
+
+        def close(self):
+            """ check the last line and return the values of all lines """
+            self.widget.check_text_line(self.line, self.start, self.seen,
+                                        self.values)
+            return self.values
+
     @Gtk.Template.Callback()
     def on_unmap_all(self, _widget):
         """ time to check list of articles """
-        self.check_buffer()
+        self.checker.flush()
 
     @Gtk.Template.Callback()
     def on_map_all(self, _widget):
-        """ write sale-variable to widget-buffer """
-        self.buffer.set_text(self.sale.text())
+        """ write sale-variable to widget-buffer, if it is not shown """
+        if not self.shown:
+            self.show_sale()
+
+    def on_sale_changed(self, *_args):
+        """ the sale may no longer be the one shown in the buffer """
+        self.shown = False
+
+    def show_sale(self):
+        """
+        write the sale to the buffer and check each line, when it has been
+        written, instead of reading and checking the whole text again
+        """
+        self.checker.cancel()
+        self.loading = True
+        self.buffer.begin_irreversible_action()
+        self.buffer.set_text("")
+        self.reset_lines()
+        writer = self.LineWriter(self)
+        self.sale.write_to(writer)
+        self.buffer.end_irreversible_action()
+        self.loading = False
+        self.reconcile_lines(writer.close())
+        self.shown = True
 
     def __init__(self, sale, win, **kwargs):
         super().__init__(**kwargs)
@@ -120,19 +198,47 @@ class PricelistWidget(Gtk.Box):
         create_action(win, "save", self.on_save_dialog)
         create_action(win, "load", self.on_load_dialog)
         create_action(win, "append", self.on_append_dialog)
+        create_action(win, "raise_prices", self.on_raise_prices, "s")
+        create_action(win, "round_prices", self.on_round_prices, "s")
+        create_action(win, "reset_counts", self.on_reset_counts)
         create_action(win, "help_workflow", self.on_help_workflow)
         create_action(win, "help_syntax", self.on_help_syntax)
 
         self.table.add(self.red_tag)
         self.table.add(self.green_tag)
         self.table.add(self.orange_tag)
-
+        # tag numbers used by pricelist_cache
+        self.tags = (self.green_tag, self.orange_tag, self.red_tag)
+        self.tag_log = None  # list of applied tags, while it is not None
+        # text is written by on_map_all or set from pricelist_cache
+        self.loading = False
+        # the buffer shows the sale, until the sale is changed elsewhere
+        self.shown = False
+        self.sale.main_list.connect("items-changed", self.on_sale_changed)
+        self.sale.totals.connect("notify", self.on_sale_changed)
+        self.sale.orders.connect("notify", self.on_sale_changed)
+
+        # LineState of each line of the buffer, None if not yet checked.
+        # self.lines is None, if the whole buffer must be checked.
+        self.lines = None
+        # name -> LineStates with this article name
+        self.line_names = {}
+        # (first line, old lines, new lines) of edits since the last check
+        self.edits = []
+        # all edits, that may not yet be applied to LineState.pos
+        self.edit_log = []
+        # names of lines removed since the last check
+        self.removed = set()
+        # bursts of edits are checked at once
+        self.checker = Debounce(self.check_changes, appargs.check_delay,
+                                appargs.check_max_delay)
+
+        self.buffer.connect('insert-text', self.on_insert_text)
+        self.buffer.connect('delete-range', self.on_delete_range)
         self.buffer.connect('changed', self.on_buffer_changed)
         self.check_buffer()
         self.buffer.connect('notify::cursor-position', self.on_cursor)
 
-        self.cursor_seen_in_line = (-1, -1)
-
         filters = Gio.ListStore.new(Gtk.FileFilter)
         filters.append(self.cashbox_file_filter)
 
@@ -148,31 +254,98 @@ class PricelistWidget(Gtk.Box):
         """ redo last undo """
         self.buffer.redo()
 
-    def on_cursor(self, buffer, pos):
-        """ cursor has moved """
-        pos = buffer.get_property("cursor-position")
-        (a, b) = self.cursor_seen_in_line
-        if pos < a or pos > b:
-            self.check_buffer()
+    def on_raise_prices(self, _action, param):
+        """ raise all prices by the percent given by the menu item """
+        self.checker.flush()
+        self.sale.raise_prices(param.get_string())
+        self.show_sale()
+
+    def on_round_prices(self, _action, param):
+        """ round all prices to the amount given by the menu item """
+        self.checker.flush()
+        self.sale.round_prices(str2cent(param.get_string()))
+        self.show_sale()
+
+    def on_reset_counts(self, _action, _param):
+        """ reset the counts of all Articles """
+        self.checker.flush()
+        self.sale.count_zero()
+        self.show_sale()
+
+    def on_cursor(self, _buffer, _pos):
+        """ cursor has moved, show the hints of its line """
+        self.show_hint()
+
+    def show_hint(self):
+        """ show the errors of the line with the cursor """
+        hint = ""
+        if self.buffer.get_char_count() == 0:
+            hint = _("please add lines with article and price")
+        elif self.lines:
+            cursor = self.buffer.get_iter_at_offset(
+                self.buffer.get_property("cursor-position"))
+            line_nr = cursor.get_line()
+            if line_nr < len(self.lines):
+                error = self.line_error(line_nr)
+                if error:
+                    hint = f"line {line_nr+1}: "+", ".join(error)
+        self.error.set_label(hint)
+
+    def line_error(self, line_nr):
+        """
+        hints of a line. A changed line, that has not yet been checked, is
+        parsed without coloring it, to keep the error label up to date.
+        """
+        state = self.lines[line_nr]
+        if state is not None:
+            self.line_info(state)
+            return state.error
+        state = self.parse_line(self.get_line(line_nr)[0])
+        if state.li is None:
+            return []
+        double = any(other.candidate and self.line_pos(other) < line_nr
+                     for other in self.line_names.get(state.name, []))
+        state.li.other_err["double_name"] = state.name if double else None
+        return self.color_text(None, 0, state.li)
+
+    def get_line(self, line_nr):
+        """ return (text, offset) of a line of the buffer """
+        start = self.buffer.get_iter_at_line(line_nr)[1]
+        end = start.copy()
+        if not end.ends_line():
+            end.forward_to_line_end()
+        return (self.buffer.get_text(start, end, False), start.get_offset())
+
+    def on_insert_text(self, _buffer, location, text, _length):
+        """ the line of location is replaced by the inserted lines """
+        self.add_edit(location.get_line(), 1,
+                      1 + len(LINE_BREAK.findall(text)))
+
+    def on_delete_range(self, _buffer, start, end):
+        """ the lines from start to end are replaced by one line """
+        self.add_edit(start.get_line(), end.get_line() - start.get_line() + 1,
+                      1)
+
+    def add_edit(self, first, n_old, n_new):
+        """
+        keep self.lines in line with the buffer, the new lines are checked
+        by check_changes()
+        """
+        if self.loading or self.lines is None:
+            return
+        for state in self.lines[first:first+n_old]:
+            if state:
+                self.del_line_name(state)
+                self.removed.add(state.name)
+        self.lines[first:first+n_old] = [None] * n_new
+        self.edits.append((first, n_old, n_new))
+        self.edit_log.append((first, n_old, n_new))
 
     def check_buffer_line(self, line):
         """ check for line for syntax errors """
         line_info = self.LineInfo()
-        # get the last match of price in a line
-        p_iter = list(self.cshbx.re_price.finditer(line))
-        if p_iter:
-            line_info.p = list(p_iter)[-1]
-            a_line = line[:line_info.p.start(0)]
-            line_info.n = self.cshbx.re_name.match(a_line)
-            if not line_info.n:
-                line_info.n_err = self.cshbx.re_some.match(a_line)
-
-            c_line = line[line_info.p.end(0):]
-            line_info.c = self.cshbx.re_count.match(c_line)
-            if not line_info.c:
-                line_info.c_err = self.cshbx.re_some.match(c_line)
-        else:
-            line_info.p_err = self.cshbx.re_some.match(line)
+        (line_info.n, line_info.p, line_info.c, line_info.n_err,
+         line_info.p_err, line_info.c_err) = self.cshbx.scan(line)
         return line_info
 
     def color_text(self, buffer, line_start, li):
@@ -186,11 +359,18 @@ class PricelistWidget(Gtk.Box):
         green: ok
         orange: the marked text could be used if another part would be fixed
         red: the text itself must be fixed
+
+        Without a buffer only the hints are returned.
         """
         def apply_tag(start, end, tag):
+            if buffer is None:
+                return
             iter_start = buffer.get_iter_at_offset(line_start + start)
             iter_end = buffer.get_iter_at_offset(line_start + end)
             buffer.apply_tag(tag, iter_start, iter_end)
+            if self.tag_log is not None:
+                self.tag_log.append((self.tags.index(tag), line_start + start,
+                                     line_start + end))
 
         error = []
         if li.line_ok():
@@ -230,77 +410,285 @@ class PricelistWidget(Gtk.Box):
         return error
 
     def on_buffer_changed(self, _buffer):
-        """ time to check list of articles """
-        self.check_buffer()
+        """
+        check the changed lines, when the edits stop for a moment.
+        The hints of the cursor line are shown at once.
+        """
+        if not self.loading:
+            self.checker.schedule()
+            self.show_hint()
+
+    def parse_line(self, line):
+        """ return the LineState of line, without colors and double names """
+        state = self.LineState(line)
+        if line.lstrip()[:1] != "#":
+            # n=article name, p=article price, c=article count
+            li = self.check_buffer_line(line)
+            state.li = li
+            if li.n:
+                state.name = line[li.n.start(2):li.n.end(2)]
+                li.check_name_len(state.name, appargs.max_name_len)
+                state.candidate = bool(li.p and li.c and
+                                       not li.other_err["name_to_long"])
+        return state
+
+    def show_line(self, state, line_start, double):
+        """
+        color the line of state starting at line_start and return its
+        item_value()
+        """
+        li = self.line_info(state)
+        state.double = double
+        if li is not None:
+            li.other_err["double_name"] = state.name if double else None
+            state.error = self.color_text(self.buffer, line_start, li)
+        return self.line_value(state)
+
+    def line_value(self, state):
+        """
+        return the item_value() of an already checked line, its Article
+        or Comment is only created, if the sale needs a new item
+        """
+        li = self.line_info(state)
+        if li is None:
+            # comment starting with "#"
+            return (False, state.text, 0, 0)
+        if not li.line_ok():
+            # error: give error message, but handled like a comment
+            return (False, state.text, 0, 0)
+        line = state.text
+        return (True, state.name,
+                str2cent(line[li.p.start(2):li.p.end(2)] + "." +
+                         line[li.p.start(4):li.p.end(4)]),
+                int("0" + line[li.p.end(5) + li.c.start(2):
+                               li.p.end(5) + li.c.end(2)]))
+
+    def line_info(self, state):
+        """
+        return the LineInfo of a checked line. A line restored from
+        pricelist_cache is parsed, when it is needed.
+        """
+        if state.error is None:
+            state.li = self.parse_line(state.text).li
+            state.error = []
+            if state.li is not None:
+                state.li.other_err["double_name"] = (state.name if state.double
+                                                     else None)
+                state.error = self.color_text(None, 0, state.li)
+        return state.li
+
+    def add_line_name(self, state, pos):
+        """ add state of line pos to the names of the lines """
+        if state.name is not None:
+            self.line_names.setdefault(state.name, []).append(state)
+            state.pos = pos
+            state.edit = len(self.edit_log)
+
+    def line_pos(self, state):
+        """
+        return the line number of a named line, that has not been edited.
+        Only the edits after its last position are applied.
+        """
+        for (first, n_old, n_new) in self.edit_log[state.edit:]:
+            if state.pos >= first + n_old:
+                state.pos += n_new - n_old
+        state.edit = len(self.edit_log)
+        return state.pos
+
+    def del_line_name(self, state):
+        """ remove state from the names of the lines """
+        if state.name is not None:
+            states = self.line_names[state.name]
+            states.remove(state)
+            if not states:
+                del self.line_names[state.name]
 
     def check_buffer(self):
         """
-        check text buffer and return the current sale represented
-        by the the buffer.
-
-        if buffer2sale == True:
-            write widget-buffer to sale
+        check the whole text buffer and reconcile all items of the sale.
+        Each line of the buffer is one item of sale.main_list, but like
+        str.splitlines() an empty last line is none.
         """
-
-        def get_text(start, end):
-            return line[start:end]
-
-        line = None
-
-        self.sale.clear()
-
+        self.checker.cancel()
         # clear color tags
         (iter1, iter2) = self.buffer.get_bounds()
         self.buffer.remove_all_tags(iter1, iter2)
         text = self.buffer.get_text(iter1, iter2, False)
 
-        hint = ""
-        if text == "":
-            hint = _("please add lines with article and price")
-        else:
-            names = []
-            line_start = 0  # start of current line in text
-            for (line_nr, line) in enumerate(text.splitlines()):
-
-                cursor = self.buffer.get_property("cursor-position")
-
-                if line_start <= cursor <= line_start+len(line):
-                    self.cursor_seen_in_line = (line_start,
-                                                line_start+len(line))
-
-                if line.lstrip()[:1] == "#":
-                    # comment starting with "#"
-                    self.sale.main_list.append(Comment(line))
-                else:
-                    # n=article name, p=article price, c=article count
-                    li = self.check_buffer_line(line)
-                    if li.n:
-                        name = get_text(li.n.start(2), li.n.end(2))
-                        if name in names:
-                            li.other_err["double_name"] = name
-                        li.check_name_len(name, appargs.max_name_len)
-                    error = self.color_text(self.buffer, line_start, li)
-
-                    if li.line_ok():
-                        names.append(name)
-                        article = Article(
-                            name, str2cent(get_text(li.p.start(2), li.p.end(2))
-                                           + "." + get_text(li.p.start(4),
-                                           li.p.end(4))),
-                            int("0" + get_text(li.p.end(5) + li.c.start(2),
-                                               li.p.end(5) + li.c.end(2))))
-                        # eprint(f"article=<{article}>")
-                        self.sale.main_list.append(article)
-                    else:
-                        # error: give error message, but handled like a comment
-                        self.sale.main_list.append(Comment(line))
-
-                    if line_start <= cursor <= line_start+len(line) and error:
-                        hint = f"line {line_nr+1}: "+", ".join(error)
+        self.reset_lines()
+        # collect all values, to change sale at once at the end
+        values = []
+        seen = set()  # names of lines before, that may be ok
+        for match in LINE.finditer(text):
+            self.check_text_line(match.group(1), match.start(), seen, values)
+            if not match.group(2):
+                break
+        self.reconcile_lines(values)
+
+    def reset_lines(self):
+        """ forget the LineStates, before all lines are checked again """
+        self.lines = []
+        self.line_names = {}
+        self.edits = []
+        self.edit_log = []
+        self.removed = set()
+
+    def restore_lines(self, text, lines):
+        """
+        set the LineStates of text from the (name, candidate, double) of
+        its lines, saved by pricelist_cache
+        """
+        self.reset_lines()
+        for (match, (name, candidate, double)) in zip(LINE.finditer(text),
+                                                      lines):
+            state = self.LineState(match.group(1))
+            (state.name, state.candidate, state.double) = (name, candidate,
+                                                           double)
+            state.error = None  # parsed by line_info(), when it is needed
+            self.add_line_name(state, len(self.lines))
+            self.lines.append(state)
+
+    def check_text_line(self, line, line_start, seen, values):
+        """
+        check and color the next line of the buffer starting at line_start,
+        and append its item_value() to values. seen are the names of the
+        lines before, that may be ok.
+        """
+        state = self.parse_line(line)
+        self.add_line_name(state, len(self.lines))
+        self.lines.append(state)
+        values.append(self.show_line(state, line_start, state.name in seen))
+        if state.candidate:
+            seen.add(state.name)
+
+    def reconcile_lines(self, values):
+        """
+        reconcile all items of the sale with the values of all lines, like
+        str.splitlines() an empty last line is none
+        """
+        if not self.lines[-1].text:
+            values.pop()
 
-                line_start += len(line)+1
+        with self.sale.batch():
+            reconcile(self.sale.main_list, 0, len(self.sale.main_list),
+                      values)
+        self.show_hint()
 
-        self.error.set_label(hint)
+    def check_changes(self):
+        """
+        check only the lines changed since the last check, and lines
+        whose name became double or unique by the change. Only their
+        items of sale.main_list are reconciled.
+        """
+        if self.lines is None:
+            self.check_buffer()
+            return
+        (edits, self.edits) = (self.edits, [])
+        (names, self.removed) = (self.removed, set())
+        if not edits:
+            return
+
+        (dirty, prefix, suffix, old_length) = self.edited_lines(edits)
+        line_starts = self.parse_lines(dirty, names)
+        double = self.double_lines(dirty, names)
+
+        # the edited lines keep their items, where names still match.
+        # An empty last line has no item.
+        length = len(self.lines)
+        end = length - suffix
+        values = [self.show_line(self.lines[pos], self.clear_line(
+                                    pos, line_starts), double[pos])
+                 if pos in double else self.line_value(self.lines[pos])
+                 for pos in range(prefix, end)]
+        n_items = length - (self.lines[-1].text == "")
+        n_old_items = min(old_length - suffix, len(self.sale.main_list))
+        reconcile(self.sale.main_list, prefix, n_old_items - prefix,
+                  values[:max(0, n_items - prefix)])
+        # lines, that only became double or unique
+        for pos in sorted(double):
+            if not prefix <= pos < end:
+                reconcile(self.sale.main_list, pos, 1, [self.show_line(
+                    self.lines[pos], self.clear_line(pos, line_starts),
+                    double[pos])])
+        if len(self.edit_log) > len(self.lines):
+            self.renumber_lines()
+        self.show_hint()
+
+    def renumber_lines(self):
+        """ renumber all lines once in a while, to keep the log short """
+        for (pos, state) in enumerate(self.lines):
+            state.pos = pos
+            state.edit = 0
+        self.edit_log = []
+
+    def edited_lines(self, edits):
+        """
+        return (dirty, prefix, suffix, old_length) of edits: the
+        positions of the new lines after all edits, the number of lines
+        before and after all edits, that have not been changed, and the
+        number of lines before the edits
+        """
+        dirty = set()
+        length = len(self.lines) - sum(n_new - n_old
+                                       for (_first, n_old, n_new) in edits)
+        old_length = length
+        (prefix, suffix) = (length, length)
+        for (first, n_old, n_new) in edits:
+            dirty = {pos if pos < first else pos + n_new - n_old
+                     for pos in dirty if not first <= pos < first + n_old}
+            dirty.update(range(first, first + n_new))
+            prefix = min(prefix, first)
+            suffix = min(suffix, length - first - n_old)
+            length += n_new - n_old
+        return (dirty, prefix, suffix, old_length)
+
+    def parse_lines(self, dirty, names):
+        """
+        parse the dirty lines, add their names to names and return the
+        offsets of the lines
+        """
+        line_starts = {}
+        for pos in dirty:
+            (line, line_starts[pos]) = self.get_line(pos)
+            state = self.parse_line(line)
+            self.lines[pos] = state
+            self.add_line_name(state, pos)
+            names.add(state.name)
+        return line_starts
+
+    def double_lines(self, dirty, names):
+        """
+        return {position: double} of the dirty lines and of the lines,
+        that became double or unique, because they have one of names
+        """
+        double = dict.fromkeys(dirty, False)
+        names.discard(None)
+        for name in names:
+            states = self.line_names.get(name, [])
+            if len(states) < 2 and not any(s.double for s in states):
+                continue
+            positions = [self.line_pos(s) for s in states]
+            first = min((pos for (pos, s) in zip(positions, states)
+                         if s.candidate), default=len(self.lines))
+            for (pos, state) in zip(positions, states):
+                if pos in dirty or state.double != (pos > first):
+                    double[pos] = pos > first
+        return double
+
+    def clear_line(self, pos, line_starts):
+        """
+        remove the tags of line pos, before it is colored again, and
+        return its offset. The line break may have got a tag by an insert.
+        """
+        if pos in line_starts:
+            line_start = line_starts[pos]
+        else:
+            line_start = self.buffer.get_iter_at_line(pos)[1].get_offset()
+        start = self.buffer.get_iter_at_offset(line_start)
+        end = start.copy()
+        end.forward_line()
+        self.buffer.remove_all_tags(start, end)
+        return line_start
 
     def on_save_dialog(self, _action, _param):
         """ save start """
@@ -381,22 +769,154 @@ that represents a {d.c} to show how often the {d.a} is currently sold.""")))
             self.buffer.insert(iter2, '\n'+data)
 
     def read_files(self, files):
-        """ read """
+        """
+        read the price list, use the checked result of pricelist_cache
+        if the file has not changed
+        """
         if files:
-            with open(files[0], 'r', encoding="utf-8") as p:
+            with open(files[0], 'rb') as p:
                 data = p.read()
-                self.buffer.set_text(data)
+            cached = pricelist_cache.load(files[0], data)
+            self.loading = True
+            # like open() in text mode, read CRLF lines as LF lines
+            text = data.decode("utf-8").replace("\r\n", "\n")
+            self.buffer.set_text(text)
+            self.loading = False
+            if cached:
+                (values, tags, lines) = cached
+                self.checker.cancel()
+                for (tag, start, end) in tags:
+                    self.buffer.apply_tag(
+                        self.tags[tag], self.buffer.get_iter_at_offset(start),
+                        self.buffer.get_iter_at_offset(end))
+                self.restore_lines(text, lines)
+                with self.sale.batch():
+                    reconcile(self.sale.main_list, 0,
+                              len(self.sale.main_list), values)
+                self.show_hint()
+            else:
+                self.tag_log = []
+                self.check_buffer()
+                try:
+                    pricelist_cache.save(
+                        files[0], data,
+                        item_values(self.sale.main_list, 0,
+                                    len(self.sale.main_list)),
+                        self.tag_log, [(state.name, state.candidate,
+                                        state.double) for state in self.lines])
+                except OSError:
+                    pass  # the cache is only used to start faster
+                self.tag_log = None
+            # on_map_all() keeps the text of the file
+            self.shown = True
 
 
 if __name__ == '__main__':
 
+    import random
+    import tempfile
+
     doctest.testmod()
 
+    def checked(pricelist):
+        """ items, hints and tags of each char of a checked buffer """
+        buffer = pricelist.buffer
+        return ([str(item) for item in pricelist.sale.main_list],
+                [pricelist.line_error(pos)
+                 for pos in range(len(pricelist.lines))],
+                [set(buffer.get_iter_at_offset(offset).get_tags())
+                 for offset in range(buffer.get_char_count())])
+
+    def check_random_edits(widget, full, steps=3000, seed=1):
+        """
+        edit the buffer of widget at random and compare the result of
+        check_changes() with check_buffer() of the same text in full
+        """
+        rnd = random.Random(seed)
+        pieces = ["Apple", " 1.00", "\n", "#", "x", " 2", "Kiwi 0.50\n",
+                  "\u2029", "Banana 9.99 1\n"]
+        buffer = widget.buffer
+        for (text, n_items) in [("", 0), ("\n", 1), ("Kiwi 0.50\n", 1),
+                                ("Kiwi 0.50\n\n", 2)]:
+            buffer.set_text(text)
+            widget.check_buffer()
+            assert len(widget.sale.main_list) == n_items, text
+        buffer.set_text("# fruits\nBanana 1.10 2\nApple 2.00\nApple 3.00\n"
+                        "Pear 1x\n\nKiwi 0.50 1")
+        widget.check_buffer()
+        for step in range(steps):
+            text = buffer.get_text(*buffer.get_bounds(), False)
+            start = rnd.randint(0, len(text))
+            if not text or rnd.random() < 0.55:
+                buffer.insert(buffer.get_iter_at_offset(start),
+                              rnd.choice(pieces))
+            else:
+                end = min(len(text), start + rnd.randint(0, 12))
+                buffer.delete(buffer.get_iter_at_offset(start),
+                              buffer.get_iter_at_offset(end))
+            if step % 7 == 0:
+                widget.checker.flush()
+                full.buffer.set_text(
+                    buffer.get_text(*buffer.get_bounds(), False))
+                full.check_buffer()
+                assert checked(widget) == checked(full), step
+                assert (len(widget.sale.main_list) ==
+                        len(full.buffer.get_text(
+                            *full.buffer.get_bounds(), False).splitlines()))
+                # the lines checked while the sale is written are checked
+                # like the same text in full
+                full.show_sale()
+                shown = checked(full)
+                full.check_buffer()
+                assert shown == checked(full), step
+
+    def check_cache(cached, full):
+        """
+        read a price list with full, and again with cached from
+        pricelist_cache: cached must not check the whole buffer, neither
+        to read it, nor to show it, nor after an edit
+        """
+        calls = []
+        with tempfile.TemporaryDirectory() as tmp:
+            (user_app_dir, appargs.user_app_dir) = (appargs.user_app_dir, tmp)
+            pricelist = os.path.join(tmp, "fruits.cshbx")
+            with open(pricelist, "w", encoding="utf-8") as p:
+                p.write("# fruits\nBanana 1.10 2\nApple 2.00\nApple 3.00\n"
+                        "Pear 1x\n\nKiwi 0.50 1\n")
+            full.read_files([pricelist])
+            cached.check_buffer = lambda: calls.append("check_buffer")
+            cached.show_sale = lambda: calls.append("show_sale")
+            cached.read_files([pricelist])
+            cached.on_map_all(cached)
+            assert not calls, calls
+            assert checked(cached) == checked(full)
+            for pricelist in (cached, full):
+                pricelist.buffer.insert(pricelist.buffer.get_iter_at_offset(9),
+                                        "Apple 1.00\n")
+                pricelist.checker.flush()
+            assert not calls, calls
+            assert checked(cached) == checked(full)
+            # the edited sale is shown once, until it is changed elsewhere,
+            # e.g. by the SaleWidget
+            del cached.show_sale
+            cached.on_map_all(cached)
+            cached.show_sale = lambda: calls.append("show_sale")
+            cached.on_map_all(cached)
+            assert not calls, calls
+            cached.sale.main_list[1].count = 4
+            cached.on_map_all(cached)
+            assert calls == ["show_sale"], calls
+            appargs.user_app_dir = user_app_dir
+
     class PricelistWindow(MinWindow):
         """ Test Class """
 
         def __init__(self, **kwargs):
             super().__init__(**kwargs)
+            check_random_edits(PricelistWidget(Sale(), win=self),
+                               PricelistWidget(Sale(), win=self))
+            check_cache(PricelistWidget(Sale(), win=self),
+                        PricelistWidget(Sale(), win=self))
             sale = Sale()
 
             pricelist_widget = PricelistWidget(sale, win=self)
@@ -0,0 +1,354 @@
+#!/usr/bin/python3
+
+# pure_model.py
+#
+# Copyright:
+#   Copyright (C) 2024-2025 Bernd Schumacher <bernd@bschu.de>
+#
+# License: GPL-3.0+
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#   .
+#   This package is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#   .
+#   You should have received a copy of the GNU General Public License
+#   along with this program. If not, see <https://www.gnu.org/licenses/>.
+# Comment:
+#   On Debian systems, the complete text of the GNU General
+#   Public License version 3 can be found in
+#   "/usr/share/common-licenses/GPL-3".
+
+"""
+pure_model.py provides GI-free replacements for the parts of
+GObject.Object, GObject.Property, Gio.ListStore, Gio.ListModel,
+GLib.idle_add and GLib.timeout_add, that are used by DataList, Article,
+ColumnSale and Debounce.
+
+It is used by backend.py, if CASHBOX_BACKEND=python is set, to allow
+tools without a display and without GObject overhead.
+"""
+
+import os
+from abc import ABCMeta, abstractmethod
+from collections import namedtuple
+from itertools import count
+
+PRIORITY_HIGH_IDLE = 100
+SOURCE_REMOVE = False
+# like GObject.TYPE_INT64, python ints do not overflow
+TYPE_INT64 = int  # pylint: disable=invalid-name
+
+# pspec given to notify handlers, like GObject.ParamSpec
+ParamSpec = namedtuple("ParamSpec", "name")
+
+_handler_ids = count(1)
+_idle = {}  # source id -> (priority, function)
+
+
+class Property():
+    """
+    A property of an Object, that emits "notify" when it is set.
+
+    >>> class Data(Object):
+    ...     count = Property(type=int)
+    >>> data = Data()
+    >>> seen = []
+    >>> hid = data.connect("notify::count", lambda d, p: seen.append(p.name))
+    >>> data.count = 3
+    >>> (data.count, seen)
+    (3, ['count'])
+    >>> data.name = "x"
+    Traceback (most recent call last):
+    ...
+    AttributeError: 'Data' object has no attribute 'name'
+    """
+
+    def __init__(self, type=None, default=None, getter=None, setter=None):
+        # pylint: disable=redefined-builtin
+        if default is None and type in (int, float, bool):
+            default = type()
+        self.default = default
+        self.getter = getter
+        self.setter = setter
+        self.name = None
+        self.slot = None
+        self.pspec = None
+
+    def __set_name__(self, owner, name):
+        self.name = name.replace("_", "-")
+        self.slot = f"_{name}"
+        self.pspec = ParamSpec(self.name)
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        if self.getter:
+            return self.getter(obj)
+        return getattr(obj, self.slot, self.default)
+
+    def __set__(self, obj, value):
+        if self.setter:
+            self.setter(obj, value)
+        else:
+            setattr(obj, self.slot, value)
+        obj.notify_pspec(self.pspec)
+
+
+class ObjectMeta(type):
+    """ give each Property of a class a slot to store its value """
+
+    def __new__(mcs, name, bases, namespace):
+        slots = list(namespace.get("__slots__", ()))
+        for key, value in namespace.items():
+            if isinstance(value, Property) and not value.getter:
+                slots.append(f"_{key}")
+        namespace["__slots__"] = tuple(slots)
+        return super().__new__(mcs, name, bases, namespace)
+
+
+class Object(metaclass=ObjectMeta):
+    """ GI-free replacement for GObject.Object with __slots__ """
+    __slots__ = ("_handlers", "__weakref__")
+
+    def __init__(self):
+        # handler id -> (signal, callback, user data)
+        self._handlers = {}
+
+    def connect(self, signal, callback, *data):
+        """ connect callback to signal and return the handler id """
+        handler = next(_handler_ids)
+        self._handlers[handler] = (signal, callback, data)
+        return handler
+
+    def disconnect(self, handler):
+        """ disconnect a handler returned by connect """
+        del self._handlers[handler]
+
+    def handler_is_connected(self, handler):
+        """ like GObject.signal_handler_is_connected """
+        return handler in self._handlers
+
+    def emit(self, signal, *args):
+        """ call all handlers of signal """
+        for (name, callback, data) in list(self._handlers.values()):
+            if name == signal:
+                callback(self, *args, *data)
+
+    def notify(self, name):
+        """ emit notify for the property with the given name """
+        prop = getattr(type(self), name.replace("-", "_"))
+        self.notify_pspec(prop.pspec)
+
+    def notify_pspec(self, pspec):
+        """ emit "notify" and "notify::<name>" """
+        detailed = f"notify::{pspec.name}"
+        for (name, callback, data) in list(self._handlers.values()):
+            if name in ("notify", detailed):
+                callback(self, pspec, *data)
+
+
+class ListStore(Object):
+    """ GI-free replacement for Gio.ListStore """
+    __slots__ = ("_items",)
+
+    def __init__(self):
+        super().__init__()
+        self._items = []
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, pos):
+        return self._items[pos]
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def get_n_items(self):
+        """ number of items """
+        return len(self._items)
+
+    def get_item(self, pos):
+        """ item at pos or None """
+        return self._items[pos] if 0 <= pos < len(self._items) else None
+
+    def find(self, item):
+        """ return (found, position) """
+        for pos, data in enumerate(self._items):
+            if data is item:
+                return (True, pos)
+        return (False, 0)
+
+    def append(self, item):
+        """ append item """
+        self.splice(len(self._items), 0, [item])
+
+    def insert(self, pos, item):
+        """ insert item at pos """
+        self.splice(pos, 0, [item])
+
+    def remove(self, pos):
+        """ remove item at pos """
+        self.splice(pos, 1, [])
+
+    def remove_all(self):
+        """ remove all items """
+        self.splice(0, len(self._items), [])
+
+    def splice(self, pos, n_removals, additions):
+        """ replace n_removals items at pos with additions """
+        additions = list(additions)
+        self._items[pos:pos+n_removals] = additions
+        self.emit("items-changed", pos, n_removals, len(additions))
+
+
+class ListModelMeta(ObjectMeta, ABCMeta):
+    """ ObjectMeta for classes with abstract methods """
+
+
+class ListModel(Object, metaclass=ListModelMeta):
+    """
+    GI-free replacement for a python implementation of Gio.ListModel.
+    Subclasses define do_get_n_items() and do_get_item().
+
+    >>> ListModel()  # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+    ...
+    TypeError: Can't instantiate abstract class ListModel ...
+    """
+    __slots__ = ()
+
+    @abstractmethod
+    def do_get_n_items(self):
+        """ number of items """
+
+    @abstractmethod
+    def do_get_item(self, pos):
+        """ item at pos """
+
+    def __len__(self):
+        return self.do_get_n_items()
+
+    def __getitem__(self, pos):
+        if pos < 0:
+            pos += self.do_get_n_items()
+        if not 0 <= pos < self.do_get_n_items():
+            raise IndexError("list index out of range")
+        return self.do_get_item(pos)
+
+    def __iter__(self):
+        for pos in range(self.do_get_n_items()):
+            yield self.do_get_item(pos)
+
+    def get_n_items(self):
+        """ number of items """
+        return self.do_get_n_items()
+
+    def get_item(self, pos):
+        """ item at pos or None """
+        if 0 <= pos < self.do_get_n_items():
+            return self.do_get_item(pos)
+        return None
+
+    def items_changed(self, pos, n_removals, n_additions):
+        """ emit items-changed """
+        self.emit("items-changed", pos, n_removals, n_additions)
+
+
+def idle_add(function, priority=PRIORITY_HIGH_IDLE):
+    """
+    Without a main loop, functions are collected until main_iteration().
+    """
+    source = next(_handler_ids)
+    _idle[source] = (priority, function)
+    return source
+
+
+def timeout_add(_interval, function, priority=PRIORITY_HIGH_IDLE):
+    """
+    Without a main loop, the interval is ignored and function is called by
+    main_iteration() like an idle function.
+    """
+    return idle_add(function, priority)
+
+
+def source_remove(source):
+    """ remove a source returned by idle_add """
+    _idle.pop(source, None)
+
+
+def main_iteration():
+    """ call all functions added by idle_add """
+    while _idle:
+        source = min(_idle, key=lambda key: _idle[key][0])
+        (priority, function) = _idle.pop(source)
+        if function():
+            # like GLib.SOURCE_CONTINUE
+            _idle[source] = (priority, function)
+
+
+def get_user_data_dir():
+    """ like GLib.get_user_data_dir """
+    return os.environ.get("XDG_DATA_HOME",
+                          os.path.join(os.path.expanduser("~"), ".local",
+                                       "share"))
+
+
+if __name__ == '__main__':
+
+    import doctest
+    doctest.testmod()
+
+    class Data(Object):
+        """ Test Data """
+        name = Property(type=str)
+        count = Property(type=int)
+
+    store = ListStore()
+    changes = []
+    store.connect("items-changed", lambda s, *args: changes.append(args))
+    data1 = Data()
+    data1.name = "one"
+    store.append(data1)
+    store.splice(0, 1, [Data(), Data()])
+    assert changes == [(0, 0, 1), (0, 1, 2)]
+    assert len(store) == 2 and store.find(data1) == (False, 0)
+    assert store.find(store[1]) == (True, 1)
+    assert data1.count == 0 and Data().name is None
+
+    notified = []
+    hid = data1.connect("notify", lambda d, p, x: notified.append((p, x)), 7)
+    data1.count = 2
+    data1.notify("name")
+    assert notified == [(ParamSpec("count"), 7), (ParamSpec("name"), 7)]
+    data1.disconnect(hid)
+    assert not data1.handler_is_connected(hid)
+
+    called = []
+    idle_add(lambda: called.append(1))
+    source_remove(idle_add(lambda: called.append(2)))
+    main_iteration()
+    assert called == [1]
+
+    class Squares(ListModel):
+        """ Test ListModel """
+        __slots__ = ()
+
+        def do_get_n_items(self):
+            """ number of squares """
+            return 4
+
+        def do_get_item(self, pos):
+            """ square of pos """
+            return pos * pos
+
+    squares = Squares()
+    assert list(squares) == [0, 1, 4, 9] and squares[-1] == 9
+    assert squares.get_item(4) is None and len(squares) == 4
+
+    print("all asserts have been ok")
@@ -29,7 +29,6 @@ import sys
 import os
 import pathlib
 from datetime import datetime
-import gi
 
 dir1 = os.path.dirname(os.path.realpath(__file__))
 dir2 = os.path.dirname(dir1)
@@ -37,21 +36,26 @@ sys.path.append(dir2)
 
 try:
     from cashbox.utils import err
+    from cashbox.backend import get_user_data_dir
 except ImportError as exc:
     print('Error: cashbox modules not found.', exc)
     sys.exit(1)
 
-try:
-    gi.require_version('Gtk', '4.0')
-    gi.require_version(namespace='Adw', version='1')
-    from gi.repository import GLib, Adw, Gio
-except (ImportError, ValueError) as exc:
-    print('Error: Dependencies not met.', exc)
-    sys.exit(1)
+if __name__ == '__main__':
+    try:
+        import gi
+        gi.require_version('Gtk', '4.0')
+        gi.require_version(namespace='Adw', version='1')
+        from gi.repository import GLib, Adw, Gio
+    except (ImportError, ValueError) as exc:
+        print('Error: Dependencies not met.', exc)
+        sys.exit(1)
 
 
 class AttrDict(dict):
     """ access dictionary as attributes """
+    # each option of the application is an attribute
+    # pylint: disable=too-many-instance-attributes
     application_id = "de.bschu.cashbox"
     application_version = "0.3.3"
     max_name_len = 40
@@ -75,7 +79,7 @@ class AttrDict(dict):
         Set defaults for global variable "appargs".
         """
         # set default opts
-        self.user_app_dir = os.path.join(GLib.get_user_data_dir(),
+        self.user_app_dir = os.path.join(get_user_data_dir(),
                                          self.application_id)
         self.system_app_dir = os.path.join("/", "usr", "share", "cashbox")
         self.css_path = os.path.join(self.system_app_dir, "cashbox.css")
@@ -84,6 +88,11 @@ class AttrDict(dict):
 
         self.currency = "Dollar"
         self.test_small_display = False
+        self.compact = False
+        # ms to wait for more edits before the pricelist is checked, but
+        # not longer than check_max_delay ms after the first edit
+        self.check_delay = 300
+        self.check_max_delay = 1000
 
     def read_appargs(self, opts, moreargs):
         """ get args from gnome """
@@ -92,6 +92,7 @@ class ReceiptWidget(Gtk.Box):
     money_out = Gtk.Template.Child()
     file_dialog = Gtk.Template.Child()  # Gtk.FileDialog
     ok_button = Gtk.Template.Child()
+    order_label = Gtk.Template.Child()
 
     def __init__(self, sale, win, **kwargs):
         super().__init__(**kwargs)
@@ -121,6 +122,8 @@ class ReceiptWidget(Gtk.Box):
         # sale
         self.sale = sale
         selection.set_model(self.sale.picked)
+        self.sale.orders.connect("notify::size", self.on_orders_changed)
+        self.sale.orders.connect("notify::current", self.on_orders_changed)
 
         # factory
         factory = Gtk.SignalListItemFactory()
@@ -142,6 +145,11 @@ In the {d.R} window the {d.p} to pay is shown. The paid amount can be entered \
 and the return will be shown. With 'Ok' the sale will be saved and the \
 selected {d.a} {d.cs} will be resetted for the next customer.""")))
 
+    def on_orders_changed(self, orders, _pspec):
+        """ show which of the open orders is paid """
+        self.order_label.set_label(_("order") + f" {orders.current + 1}")
+        self.order_label.set_visible(orders.size > 1)
+
     def on_money_in(self, _a, _b):
         """ x """
         money_sum = str2cent(self.money_sum_buffer.get_text())
@@ -156,16 +164,13 @@ selected {d.a} {d.cs} will be resetted for the next customer.""")))
     @Gtk.Template.Callback()
     def on_map_sum(self, _widget):
         """ x """
-        paysum = 0
-        for article in self.sale.picked:
-            paysum += article.price * article.count
-            print(f"sum=<{sum}>")
+        # the totals are always up to date, even if picked is not
+        paysum = self.sale.totals.total_cents
         if paysum > 0:
             self.ok_button.set_sensitive(True)
         else:
             self.ok_button.set_sensitive(False)
         s = cent2str(paysum)
-        print(f"on_map_sum will set <{s}>")
         self.money_sum_buffer.set_text(s, len(s))
 
     @Gtk.Template.Callback()
@@ -177,10 +182,11 @@ selected {d.a} {d.cs} will be resetted for the next customer.""")))
         save_time = datetime.now().strftime('%H-%M-%S')
         sale_file = os.path.join(session_dir, save_time + ".cshbx")
         eprint(f"sale_file=<{sale_file}>")
-        eprint(f"txt=<{self.sale.text()}>")
         with open(sale_file, 'w', encoding="utf-8") as file:
-            file.write(self.sale.text())
-        self.sale.count_zero()
+            self.sale.write_to(file)
+        self.sale.add_sold()
+        # other open orders are still waiting
+        self.sale.close_order()
         self.money_in_buffer.delete_text(0, -1)
         self.money_sum_buffer.delete_text(0, -1)
         self.ok_button.set_sensitive(False)
@@ -242,7 +248,8 @@ selected {d.a} {d.cs} will be resetted for the next customer.""")))
         receipt_widget_dialog = ReceiptWidgetDialog()
         receipt_widget_dialog.session.set_label(appargs.session)
         receipt_widget_dialog.sales.set_label(f"{len(names)}")
-        receipt_widget_dialog.revenue.set_label(f"{revenue/appargs.cents}")
+        # revenue is exact for any amount, no float division
+        receipt_widget_dialog.revenue.set_label(cent2str(revenue))
 
         statistic_dialog = receipt_widget_dialog.statistic_dialog
         statistic_dialog.present(self.win)
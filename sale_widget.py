@@ -76,7 +76,7 @@ class SaleWidget(Gtk.Box):
         self.sale = sale
         self.win = win
 
-        drop_down_widget = DropDownWidget(sale.drop_unpicked)
+        drop_down_widget = DropDownWidget(sale.drop_unpicked, sale=sale)
         drop_down = drop_down_widget.get_drop_down()
 
         drop_down.connect("notify::selected-item", self.do_pick_item)
@@ -96,8 +96,8 @@ To sell {d.as_}, they can be selected from a drop down menu. They will then \
 be shown in the order selected in the {d.S} widget, where the {d.c} to be \
 sold can be adjusted.
 
-The {d.as_} in the drop down menu always have the same order as in the \
-{d.Pl}. \
+The {d.as_} in the drop down menu have the same order as in the \
+{d.Pl}, unless another order is selected next to it. \
 If some {d.as_} are sold more often than others, they may be moved to the \
 beginning in the {d.Pl}, to be able to find and select them faster in future.
 """)))
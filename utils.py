@@ -26,16 +26,31 @@
 """ utils """
 
 import sys
-import gi
+import os
+import time
+
+dir1 = os.path.dirname(os.path.realpath(__file__))
+dir2 = os.path.dirname(dir1)
+sys.path.append(dir2)
 
 try:
-    gi.require_version('Gtk', '4.0')
-    gi.require_version(namespace='Adw', version='1')
-    from gi.repository import Gio
-except (ImportError, ValueError) as exc:
-    print('Error: Dependencies not met.', exc)
+    from cashbox.backend import (BACKEND, idle_add, timeout_add,
+                                 source_remove, SOURCE_REMOVE)
+except ImportError as exc:
+    print('Error: cashbox modules not found.', exc)
     sys.exit(1)
 
+# without gi only functions not needing widgets can be used
+if BACKEND == "gi":
+    try:
+        import gi
+        gi.require_version('Gtk', '4.0')
+        gi.require_version(namespace='Adw', version='1')
+        from gi.repository import Gio, GLib
+    except (ImportError, ValueError) as exc:
+        print('Error: Dependencies not met.', exc)
+        sys.exit(1)
+
 
 def widget_info(widget, level=1):
     """ widget_info
@@ -92,8 +107,93 @@ def err(msg, retcode=1):
     sys.exit(retcode)
 
 
-def create_action(window_or_application, name, function):
-    """ create ancd connect action """
-    action = Gio.SimpleAction.new(name, None)
+class BufferWriter():
+    """
+    file like object, that appends to a Gtk.TextBuffer, to be used with
+    Sale.write_to()
+    """
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+
+    def write(self, text):
+        """ append text to the buffer """
+        self.buffer.insert(self.buffer.get_end_iter(), text)
+
+
+class Debounce():
+    """
+    call function once for a burst of schedule() calls: delay ms after the
+    last call, but at most max_delay ms after the first call of the burst.
+
+    >>> calls = []
+    >>> later = Debounce(lambda: calls.append(1), 300, 1000)
+    >>> for _ in range(3):
+    ...     later.schedule()
+    >>> later.pending, calls
+    (True, [])
+    >>> later.flush()
+    >>> later.pending, calls
+    (False, [1])
+    """
+
+    def __init__(self, function, delay, max_delay):
+        self.function = function
+        self.delay = delay
+        self.max_delay = max_delay
+        self.source = None
+        self.first = None  # time of the first call of the burst
+
+    @property
+    def pending(self):
+        """ True if function will be called """
+        return self.source is not None
+
+    def schedule(self):
+        """ call function later, after more calls have been collected """
+        now = time.monotonic()
+        if self.first is None:
+            self.first = now
+        if self.source is not None:
+            source_remove(self.source)
+        rest = self.max_delay - (now - self.first) * 1000
+        wait = int(max(0, min(self.delay, rest)))
+        if wait:
+            self.source = timeout_add(wait, self.on_timeout)
+        else:
+            # too stale, call function, when the main loop is idle
+            self.source = idle_add(self.on_timeout)
+
+    def on_timeout(self):
+        """ time to call function """
+        self.source = None
+        self.first = None
+        self.function()
+        return SOURCE_REMOVE
+
+    def cancel(self):
+        """ do not call function """
+        if self.source is not None:
+            source_remove(self.source)
+        self.source = None
+        self.first = None
+
+    def flush(self):
+        """ call function now, if it is pending """
+        if self.source is not None:
+            self.cancel()
+            self.function()
+
+
+def create_action(window_or_application, name, function, parameter=None):
+    """
+    create ancd connect action
+    parameter: e.g. "s" if the menu item gives a string target
+    """
+    # pylint: disable=possibly-used-before-assignment
+    if parameter:
+        parameter = GLib.VariantType.new(parameter)
+    action = Gio.SimpleAction.new(name, parameter)
     action.connect("activate", function)
     window_or_application.add_action(action)